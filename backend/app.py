@@ -1,21 +1,52 @@
 import logging
 import os
+from datetime import timedelta
 from pathlib import Path
 
-from flask import render_template_string, send_from_directory
+import click
+from flask import g, jsonify, render_template_string, request, send_from_directory
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 import mistune
 from apscheduler.schedulers.background import BackgroundScheduler
 from flask_migrate import Migrate
 from alembic import command
 from alembic.config import Config as AlembicConfig
-from src.models import db
+from src.models import db, Currency
 
 from flask_openapi3 import OpenAPI, Info
 
-from src.constants import LOGGER_FORMAT, README_FILE
+from src.constants import (
+    ASYNC_SUBMISSIONS,
+    CACHE_PURGE_INTERVAL_SECONDS,
+    COUNTERS_FLUSH_SECONDS,
+    EVENT_INDEX_ENABLED,
+    LOGGER_FORMAT,
+    RATE_LIMIT_BUCKET_IDLE_SECONDS,
+    README_FILE,
+    REFERENCE_CURRENCY,
+    REPLICA_BIND,
+    REPLICA_CONNECT_TIMEOUT_SECONDS,
+    REPLICA_LSN_COOKIE,
+    REPLICA_LSN_COOKIE_MAX_AGE_SECONDS,
+    SNAPSHOT_DIR,
+    SUBMISSION_DRAIN_INTERVAL_SECONDS,
+)
 from src.routes.events import event_bp
+from src.routes.suggest import suggest_bp
 from src.services.backup_db_pr import run_database_backup_job
+from src.services.cache import cache_stats, purge as purge_cache
+from src.services.counters import flush_counters
+from src.services.event import (
+    archive_public_partitions,
+    locate_events,
+    process_submission_queue,
+)
+from src.services.event_index import event_index
+from src.services.exchange_rate import set_exchange_rate
+from src.services.snapshot import rebuild_snapshot
+from src.services.rate_limit import purge_idle_buckets
+from src.services.replica import require_lsn
 
 
 info = Info(title="Events API", version="1.0.0")
@@ -31,6 +62,11 @@ app = OpenAPI(
     },
 )
 
+# Trust X-Forwarded-For only for the configured number of proxy hops, so
+# request.remote_addr is the client address the rate limiter keys on. Served
+# directly, a client could otherwise pick any address by sending the header.
+app.wsgi_app = ProxyFix(app.wsgi_app, x_for=int(os.getenv("TRUSTED_PROXIES", "0")))
+
 CORS(
     app,
     resources={r"/*": {"origins": "*"}},
@@ -48,6 +84,16 @@ DATABASE_URL = f"postgresql://{os.getenv('POSTGRES_USER')}:{os.getenv('POSTGRES_
 app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URL
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+# Optional streaming replica for public reads, same credentials as the primary
+if os.getenv("POSTGRES_REPLICA_HOST"):
+    REPLICA_URL = f"postgresql://{os.getenv('POSTGRES_USER')}:{os.getenv('POSTGRES_PASSWORD')}@{os.getenv('POSTGRES_REPLICA_HOST')}:{os.getenv('POSTGRES_REPLICA_PORT', os.getenv('POSTGRES_PORT'))}/{os.getenv('POSTGRES_DB')}"
+    app.config["SQLALCHEMY_BINDS"] = {
+        REPLICA_BIND: {
+            "url": REPLICA_URL,
+            "connect_args": {"connect_timeout": REPLICA_CONNECT_TIMEOUT_SECONDS},
+        }
+    }
+
 db.init_app(app)
 migrate = Migrate(app, db)
 
@@ -71,7 +117,129 @@ scheduler = BackgroundScheduler()
 scheduler.add_job(run_database_backup_job, "interval", hours=24)
 
 
+def drain_submission_queue():
+    with app.app_context():
+        process_submission_queue()
+
+
+def purge_rate_limit_buckets():
+    with app.app_context():
+        purge_idle_buckets(timedelta(seconds=RATE_LIMIT_BUCKET_IDLE_SECONDS))
+
+
+def flush_event_counters():
+    with app.app_context():
+        flush_counters()
+
+
+def start_worker_jobs():
+    """
+    Per-worker background jobs. Every worker may run them: they coordinate
+    through Postgres, or a file lock for the cache, not through the scheduler.
+
+    Threads do not survive a fork, so with ``preload_app`` gunicorn calls this
+    from ``post_fork`` instead of at import time.
+    """
+    jobs_scheduler = BackgroundScheduler()
+    jobs_scheduler.add_job(purge_rate_limit_buckets, "interval", minutes=15)
+    jobs_scheduler.add_job(
+        purge_cache,
+        "interval",
+        seconds=CACHE_PURGE_INTERVAL_SECONDS,
+        max_instances=1,
+        coalesce=True,
+    )
+    jobs_scheduler.add_job(
+        flush_event_counters,
+        "interval",
+        seconds=COUNTERS_FLUSH_SECONDS,
+        max_instances=1,
+        coalesce=True,
+    )
+    if ASYNC_SUBMISSIONS:
+        jobs_scheduler.add_job(
+            drain_submission_queue,
+            "interval",
+            seconds=SUBMISSION_DRAIN_INTERVAL_SECONDS,
+            max_instances=1,
+            coalesce=True,
+        )
+    jobs_scheduler.start()
+
+
+if EVENT_INDEX_ENABLED:
+    # Loaded before gunicorn forks, workers share the pages copy-on-write
+    with app.app_context():
+        event_index.refresh()
+
+if os.getenv("GUNICORN_PRELOAD", "False").lower() != "true":
+    start_worker_jobs()
+
+
 app.register_api(event_bp)
+app.register_api(suggest_bp)
+
+
+@app.before_request
+def load_read_your_writes():
+    require_lsn(request.cookies.get(REPLICA_LSN_COOKIE))
+
+
+@app.after_request
+def store_read_your_writes(response):
+    # Set by note_write: the client's next reads skip a replica that is behind
+    if g.get("write_lsn"):
+        response.set_cookie(
+            REPLICA_LSN_COOKIE,
+            g.write_lsn,
+            max_age=REPLICA_LSN_COOKIE_MAX_AGE_SECONDS,
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+@app.cli.command("snapshot-rebuild")
+def snapshot_rebuild():
+    """Render every static snapshot document into SNAPSHOT_DIR."""
+    if not SNAPSHOT_DIR:
+        raise click.ClickException("SNAPSHOT_DIR is not set.")
+    count = rebuild_snapshot()
+    click.echo(f"{count} documents written to {SNAPSHOT_DIR}")
+
+
+@app.cli.command("archive-partitions")
+@click.option(
+    "--before",
+    "before_year",
+    type=int,
+    required=True,
+    help="Archive the public_events partitions of the years before this one.",
+)
+def archive_partitions(before_year):
+    """Detach old public_events partitions from the public listings."""
+    archived = archive_public_partitions(before_year)
+    for name in archived:
+        click.echo(f"Archived {name}")
+    click.echo(f"{len(archived)} partitions archived")
+
+
+@app.cli.command("locate-events")
+def locate_events_command():
+    """Fill in event coordinates from the ones written in their maps_link."""
+    count = locate_events()
+    click.echo(f"{count} events located")
+
+
+@app.cli.command("exchange-rate")
+@click.argument("currency", type=click.Choice([c.value for c in Currency]))
+@click.argument("rate", type=click.FloatRange(min=0, min_open=True))
+def exchange_rate(currency, rate):
+    """Set the value of one CURRENCY in the reference currency."""
+    if currency == REFERENCE_CURRENCY:
+        raise click.ClickException(f"{REFERENCE_CURRENCY} is the reference currency.")
+    set_exchange_rate(Currency(currency), rate)
+    click.echo(f"1 {currency} = {rate} {REFERENCE_CURRENCY}")
 
 
 @app.route("/", methods=["GET"])
@@ -183,3 +351,9 @@ def favicon():
 def health_check():
     """Route for health check."""
     return "OK", 200
+
+
+@app.route("/cache/stats", methods=["GET"])
+def cache_metrics():
+    """Hit, stale, miss and wait counters of the worker serving the request."""
+    return jsonify(cache_stats()), 200
@@ -0,0 +1,5 @@
+#!/bin/bash
+# Libera conexões de replicação para o db-replica do docker-compose.
+# Roda apenas na criação do volume (docker-entrypoint-initdb.d).
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
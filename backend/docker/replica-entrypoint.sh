@@ -0,0 +1,16 @@
+#!/bin/bash
+# Na primeira subida clona o primário com pg_basebackup; -R grava o
+# standby.signal e a conexão de replicação, então o Postgres sobe como réplica
+# somente leitura acompanhando o WAL do primário.
+set -e
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    until PGPASSWORD="$POSTGRES_PASSWORD" pg_basebackup \
+        -h "$POSTGRES_HOST" -p "$POSTGRES_PORT" -U "$POSTGRES_USER" \
+        -D "$PGDATA" -R -X stream; do
+        echo "Aguardando o primário em $POSTGRES_HOST:$POSTGRES_PORT..."
+        rm -rf "${PGDATA:?}"/*
+        sleep 2
+    done
+    chmod 700 "$PGDATA"
+fi
+exec postgres
@@ -1,6 +1,7 @@
 """Gunicorn configuration file."""
 
 import multiprocessing
+import os
 
 # Definições básicas
 workers = multiprocessing.cpu_count() * 2 + 1  # Número recomendado de workers
@@ -8,11 +9,40 @@ bind = "0.0.0.0:8000"  # Endereço e porta para o Gunicorn
 timeout = 120  # Timeout para requisições (segundos)
 loglevel = "info"  # Nível de log (info, debug, warning, error, critical)
 
+# Workers com threads: cada conexão SSE de /events/stream ocupa uma thread
+# parada esperando mensagens, não o worker inteiro. Mantenha
+# STREAM_MAX_SUBSCRIBERS abaixo de GUNICORN_THREADS para sobrar thread para
+# as demais requisições.
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "32"))
+
+# Carrega o app no master antes do fork: migrações rodam uma vez e o índice
+# em memória (EVENT_INDEX_ENABLED) é compartilhado copy-on-write pelos workers
+preload_app = True
+os.environ["GUNICORN_PRELOAD"] = "true"
+
+
+def post_fork(server, worker):
+    from app import app, start_worker_jobs
+    from src.models import db
+
+    # Conexões abertas pelo master não podem ser compartilhadas entre processos
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    start_worker_jobs()
+
+
+def worker_exit(server, worker):
+    from app import flush_event_counters
+
+    # Views e cliques ainda em memória são gravados antes do worker sair
+    flush_event_counters()
+
+
 # Para desenvolvimento, você pode querer um worker para facilitar o debugging
 # workers = 1
 
 # Opções adicionais (veja a documentação do Gunicorn para mais detalhes)
-# worker_class = 'sync' # ou 'gevent', 'eventlet', 'tornado', 'gthread' (sync é o padrão e geralmente bom)
-# threads = 1 # Para worker_class='gthread' você pode usar threads
 # backlog = 2048 # Tamanho do backlog de conexões pendentes
 # reload = False # Para reload automático de código em desenvolvimento (desativar em produção!)
@@ -1,5 +1,91 @@
+import os
+
 LOGGER_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
 
 EVENTS_FOLDER_NAME = "events"
 README_FILE = "README.md"
 aggregated_events = []
+
+REVIEW_CLAIM_BATCH_SIZE = 10
+REVIEW_CLAIM_MAX_BATCH_SIZE = 50
+REVIEW_LEASE_SECONDS = 15 * 60
+
+SUBMISSION_BATCH_SIZE = 50
+SUBMISSION_DRAIN_INTERVAL_SECONDS = 5
+ASYNC_SUBMISSIONS = os.getenv("ASYNC_SUBMISSIONS", "False").lower() == "true"
+
+SUBMIT_RATE_LIMIT_CAPACITY = 5
+SUBMIT_RATE_LIMIT_REFILL_PER_SECOND = 1 / 120
+RATE_LIMIT_BUCKET_IDLE_SECONDS = 60 * 60
+
+CACHE_DIR = os.getenv("CACHE_DIR", "/tmp/calendario-cache")
+CACHE_TTL_SECONDS = 10 * 60
+CACHE_LOCK_TIMEOUT_SECONDS = 10
+# Entries are locked through this many lock files, shared by hash of the key
+CACHE_LOCK_STRIPES = 256
+# Expired and superseded entries are deleted this often, and past this many
+# entries the least recently written are deleted too
+CACHE_PURGE_INTERVAL_SECONDS = 5 * 60
+CACHE_MAX_ENTRIES = 20000
+EVENTS_SHARD_MAX_DAYS = 400
+EVENTS_BATCH_MAX_IDS = 500
+CHANGES_PAGE_SIZE = 500
+CHANGES_MAX_PAGE_SIZE = 2000
+
+# Read replica for public reads, see src/services/replica.py
+REPLICA_BIND = "replica"
+REPLICA_CHECK_SECONDS = 2
+REPLICA_RETRY_SECONDS = 30
+REPLICA_CONNECT_TIMEOUT_SECONDS = 2
+# Carries the primary WAL position of the client's last write (read-your-writes)
+REPLICA_LSN_COOKIE = "min_lsn"
+REPLICA_LSN_COOKIE_MAX_AGE_SECONDS = 5 * 60
+
+# /events/stream, see src/services/event_stream.py. Each subscriber holds a
+# gunicorn thread, so keep STREAM_MAX_SUBSCRIBERS below GUNICORN_THREADS.
+EVENTS_NOTIFY_CHANNEL = "event_changes"
+STREAM_MAX_SUBSCRIBERS = int(os.getenv("STREAM_MAX_SUBSCRIBERS", "24"))
+STREAM_QUEUE_SIZE = 100
+STREAM_HEARTBEAT_SECONDS = 15
+
+EVENT_INDEX_ENABLED = os.getenv("EVENT_INDEX_ENABLED", "False").lower() == "true"
+EVENT_INDEX_MAX_AGE_SECONDS = 60
+
+# Static JSON snapshots are published here when set, see src/services/snapshot.py
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR")
+
+# intl language served when the requested one is missing, then the others in order
+DEFAULT_LANGUAGE = os.getenv("DEFAULT_LANGUAGE", "pt-br")
+SUPPORTED_LANGUAGES = ("pt-br", "en-us")
+
+# Prices are compared in this currency, converted with the exchange_rates table
+REFERENCE_CURRENCY = "BRL"
+
+# Proximity search (`near`), see src/services/geo.py
+GEOHASH_PRECISION = 9
+NEAR_DEFAULT_RADIUS_KM = 50
+NEAR_MAX_RADIUS_KM = 500
+
+# Recurring events, see src/services/recurrence.py. Windows without an end are
+# expanded this far ahead, and no series yields more occurrences per window.
+RECURRENCE_HORIZON_DAYS = 365
+RECURRENCE_MAX_OCCURRENCES = 500
+# A series with COUNT or UNTIL has at most this many occurrences, and its UNTIL
+# is at most this many years ahead
+RECURRENCE_MAX_COUNT = 1000
+RECURRENCE_MAX_UNTIL_YEARS = 10
+# Occurrences walked by one expansion, however few fall inside the window
+RECURRENCE_MAX_STEPS = 50000
+
+# /suggest, see src/services/suggest.py
+SUGGEST_DEFAULT_LIMIT = 8
+SUGGEST_MAX_LIMIT = 25
+SUGGEST_INDEX_MAX_AGE_SECONDS = 60
+
+# View and click counters are written in bulk this often, see src/services/counters.py
+COUNTERS_FLUSH_SECONDS = 30
+
+# /events/<id>/related, see src/services/related.py
+RELATED_DEFAULT_LIMIT = 6
+RELATED_MAX_LIMIT = 24
+RELATED_INDEX_MAX_AGE_SECONDS = 60
@@ -11,3 +11,15 @@ class EventNotFoundException(Exception):
     def __init__(self, message="Event not found."):
         self.message = message
         super().__init__(self.message)
+
+
+class ReviewClaimConflictException(Exception):
+    def __init__(self, message="Event is claimed by another moderator."):
+        self.message = message
+        super().__init__(self.message)
+
+
+class StreamUnavailableException(Exception):
+    def __init__(self, message="Too many open event streams, try again later."):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,62 @@
+"""add event submissions queue
+
+Revision ID: 0456abab7796
+Revises: 6b7f226618c0
+Create Date: 2026-10-19 11:03:27.904512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0456abab7796"
+down_revision: Union[str, None] = "6b7f226618c0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "event_submissions",
+        sa.Column("id", sa.String(length=32), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "queued", "accepted", "rejected", "failed", name="submission_status"
+            ),
+            nullable=False,
+        ),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("event_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_event_submissions_queued_created_at",
+        "event_submissions",
+        ["created_at"],
+        postgresql_where=sa.text("status = 'queued'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_event_submissions_queued_created_at", table_name="event_submissions"
+    )
+    op.drop_table("event_submissions")
+    op.execute("DROP TYPE submission_status")
@@ -0,0 +1,42 @@
+"""add events version
+
+Revision ID: 06d0a19b6360
+Revises: 433011f13bb8
+Create Date: 2026-10-19 13:47:55.602181
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "06d0a19b6360"
+down_revision: Union[str, None] = "433011f13bb8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SEQUENCE events_version_seq")
+    # Existing rows get distinct versions from the default while the column is added
+    op.add_column(
+        "events",
+        sa.Column(
+            "version",
+            sa.BigInteger(),
+            server_default=sa.text("nextval('events_version_seq')"),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_events_version", "events", ["version"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_events_version", table_name="events")
+    op.drop_column("events", "version")
+    op.execute("DROP SEQUENCE events_version_seq")
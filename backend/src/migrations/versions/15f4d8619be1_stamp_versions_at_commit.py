@@ -0,0 +1,94 @@
+"""stamp versions at commit
+
+Revision ID: 15f4d8619be1
+Revises: 30dfa1c2228b
+Create Date: 2026-10-19 22:31:08.442817
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "15f4d8619be1"
+down_revision: Union[str, None] = "30dfa1c2228b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+RECORD_EVENT_TOMBSTONE = """
+    CREATE OR REPLACE FUNCTION record_event_tombstone() RETURNS trigger AS $$
+    BEGIN
+        {record}
+        RETURN OLD;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+# Upserting would fire an UPDATE, and stamping the row updates it again
+RECORD = """
+        DELETE FROM event_tombstones WHERE event_id = OLD.id;
+        INSERT INTO event_tombstones (event_id, version)
+        VALUES (OLD.id, nextval('events_version_seq'));
+"""
+
+UPSERT = """
+        INSERT INTO event_tombstones (event_id, version)
+        VALUES (OLD.id, nextval('events_version_seq'))
+        ON CONFLICT (event_id) DO UPDATE
+        SET version = EXCLUDED.version, deleted_at = now();
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A version drawn while a transaction runs can commit after a higher one,
+    # and /events/changes would skip it once a client moved past the higher
+    # one. Rows are stamped again when their transaction commits instead,
+    # holding one lock until the commit, so versions become visible in order.
+    op.execute(
+        """
+        CREATE FUNCTION stamp_change_version() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('events_version_seq'));
+            EXECUTE format(
+                'UPDATE %I.%I SET version = nextval(''events_version_seq'') '
+                'WHERE %I = ($1).%I',
+                TG_TABLE_SCHEMA,
+                TG_TABLE_NAME,
+                TG_ARGV[0],
+                TG_ARGV[0]
+            )
+            USING NEW;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(RECORD_EVENT_TOMBSTONE.format(record=RECORD))
+    op.execute(
+        """
+        CREATE CONSTRAINT TRIGGER public_events_stamp_version
+        AFTER INSERT ON public_events
+        DEFERRABLE INITIALLY DEFERRED
+        FOR EACH ROW EXECUTE FUNCTION stamp_change_version('id')
+        """
+    )
+    op.execute(
+        """
+        CREATE CONSTRAINT TRIGGER event_tombstones_stamp_version
+        AFTER INSERT ON event_tombstones
+        DEFERRABLE INITIALLY DEFERRED
+        FOR EACH ROW EXECUTE FUNCTION stamp_change_version('event_id')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER event_tombstones_stamp_version ON event_tombstones")
+    op.execute("DROP TRIGGER public_events_stamp_version ON public_events")
+    op.execute(RECORD_EVENT_TOMBSTONE.format(record=UPSERT))
+    op.execute("DROP FUNCTION stamp_change_version()")
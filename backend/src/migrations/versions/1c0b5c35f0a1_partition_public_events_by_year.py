@@ -0,0 +1,219 @@
+"""partition public events by year
+
+Revision ID: 1c0b5c35f0a1
+Revises: dc0f2cb1e9a1
+Create Date: 2026-10-19 18:12:44.670392
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1c0b5c35f0a1"
+down_revision: Union[str, None] = "dc0f2cb1e9a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Partitions created ahead of time, past this one they are created on demand
+YEARS_AHEAD = 2
+
+REFRESH_PUBLIC_EVENT = """
+    CREATE OR REPLACE FUNCTION refresh_public_event(p_event_id integer) RETURNS void AS $$
+    BEGIN
+        DELETE FROM public_events WHERE id = p_event_id;
+        {ensure_partition}
+        INSERT INTO public_events (
+            id, organization_name, event_name, start_datetime, end_datetime,
+            maps_link, online, event_link, address, state, is_free, status,
+            version, tags, intl
+        )
+        SELECT
+            e.id, e.organization_name, e.event_name, e.start_datetime,
+            e.end_datetime, e.maps_link, e.online, e.event_link, e.address,
+            e.state, e.is_free, e.status, e.version,
+            COALESCE(
+                (
+                    SELECT array_agg(t.name ORDER BY et.id)
+                    FROM event_tags et
+                    JOIN tags t ON t.id = et.tag_id
+                    WHERE et.event_id = e.id
+                ),
+                '{{}}'
+            ),
+            COALESCE(
+                (
+                    SELECT jsonb_object_agg(
+                        i.lang,
+                        jsonb_build_object(
+                            'event_edition', i.event_edition,
+                            'cost', i.cost,
+                            'currency', i.currency,
+                            'banner_link', i.banner_link,
+                            'short_description', i.short_description
+                        )
+                    )
+                    FROM event_intl i
+                    WHERE i.event_id = e.id
+                ),
+                '{{}}'
+            )
+        FROM events e
+        WHERE e.id = p_event_id AND e.status = 'approved';
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+ENSURE_PARTITION = """
+        PERFORM create_public_events_partition(
+            EXTRACT(YEAR FROM e.start_datetime)::integer
+        )
+        FROM events e
+        WHERE e.id = p_event_id AND e.status = 'approved';
+"""
+
+
+def _rebuild_table(partitioned: bool) -> None:
+    """Recreate public_events, keeping its rows, indexes and triggers."""
+    op.rename_table("public_events", "public_events_old")
+    op.execute(
+        "ALTER TABLE public_events_old "
+        "RENAME CONSTRAINT public_events_pkey TO public_events_old_pkey"
+    )
+
+    op.create_table(
+        "public_events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("organization_name", sa.String(), nullable=False),
+        sa.Column("event_name", sa.String(), nullable=False),
+        sa.Column("start_datetime", sa.DateTime(), nullable=False),
+        sa.Column("end_datetime", sa.DateTime(), nullable=False),
+        sa.Column("maps_link", sa.String(), nullable=True),
+        sa.Column("online", sa.Boolean(), nullable=True),
+        sa.Column("event_link", sa.String(), nullable=True),
+        sa.Column("address", sa.String(), nullable=True),
+        sa.Column(
+            "state",
+            postgresql.ENUM(name="states", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("is_free", sa.Boolean(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="event_status", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "tags",
+            postgresql.ARRAY(sa.String()),
+            server_default="{}",
+            nullable=False,
+        ),
+        sa.Column(
+            "intl",
+            postgresql.JSONB(),
+            server_default="{}",
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["id"], ["events.id"], ondelete="CASCADE"),
+        # A partitioned table's primary key must contain the partition key
+        sa.PrimaryKeyConstraint(
+            *(["id", "start_datetime"] if partitioned else ["id"]),
+            name="public_events_pkey",
+        ),
+        **(
+            {"postgresql_partition_by": "RANGE (start_datetime)"} if partitioned else {}
+        ),
+    )
+
+    if partitioned:
+        op.execute(
+            f"""
+            SELECT create_public_events_partition(year)
+            FROM (
+                SELECT generate_series(
+                    EXTRACT(YEAR FROM now())::integer,
+                    EXTRACT(YEAR FROM now())::integer + {YEARS_AHEAD}
+                )
+                UNION
+                SELECT EXTRACT(YEAR FROM start_datetime)::integer
+                FROM public_events_old
+            ) AS years(year)
+            """
+        )
+
+    op.execute("INSERT INTO public_events SELECT * FROM public_events_old")
+    op.drop_table("public_events_old")
+
+    op.create_index(
+        "ix_public_events_start_datetime", "public_events", ["start_datetime"]
+    )
+    op.create_index("ix_public_events_state", "public_events", ["state"])
+    op.create_index(
+        "ix_public_events_tags", "public_events", ["tags"], postgresql_using="gin"
+    )
+    op.create_index("ix_public_events_version", "public_events", ["version"])
+
+    # Created after the copy: the rows moved are not new tombstones or rollups
+    op.execute(
+        """
+        CREATE TRIGGER public_events_record_tombstone
+        AFTER DELETE ON public_events
+        FOR EACH ROW EXECUTE FUNCTION record_event_tombstone()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER public_events_clear_tombstone
+        AFTER INSERT ON public_events
+        FOR EACH ROW EXECUTE FUNCTION clear_event_tombstone()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER public_events_day_rollup
+        AFTER INSERT OR DELETE ON public_events
+        FOR EACH ROW EXECUTE FUNCTION update_event_day_rollup()
+        """
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One partition per start year. Archived partitions are renamed when
+    # detached, so a re-approved old event gets a fresh, empty partition.
+    op.execute(
+        """
+        CREATE FUNCTION create_public_events_partition(p_year integer) RETURNS void AS $$
+        DECLARE
+            partition_name text := format('public_events_%s', p_year);
+        BEGIN
+            IF to_regclass(partition_name) IS NULL THEN
+                PERFORM pg_advisory_xact_lock(hashtext('public_events_partitions'));
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF public_events '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    partition_name,
+                    make_date(p_year, 1, 1),
+                    make_date(p_year + 1, 1, 1)
+                );
+            END IF;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    _rebuild_table(partitioned=True)
+    op.execute(REFRESH_PUBLIC_EVENT.format(ensure_partition=ENSURE_PARTITION))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(REFRESH_PUBLIC_EVENT.format(ensure_partition=""))
+    _rebuild_table(partitioned=False)
+    op.execute("DROP FUNCTION create_public_events_partition(integer)")
@@ -0,0 +1,48 @@
+"""add event counters
+
+Revision ID: 30dfa1c2228b
+Revises: 70bc68690b2b
+Create Date: 2026-10-19 21:52:36.904117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "30dfa1c2228b"
+down_revision: Union[str, None] = "70bc68690b2b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "event_counters",
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("views", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("clicks", sa.BigInteger(), server_default="0", nullable=False),
+        # A click on the event link is worth more than a view of its page
+        sa.Column(
+            "score",
+            sa.BigInteger(),
+            sa.Computed("views + 5 * clicks", persisted=True),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("event_id"),
+    )
+    op.create_index("ix_event_counters_score", "event_counters", ["score"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_event_counters_score", table_name="event_counters")
+    op.drop_table("event_counters")
@@ -0,0 +1,106 @@
+"""add archived event years
+
+Revision ID: 381055ffb876
+Revises: 7f5399c34e47
+Create Date: 2026-10-20 11:02:37.518820
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "381055ffb876"
+down_revision: Union[str, None] = "7f5399c34e47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+REFRESH_PUBLIC_EVENT = """
+    CREATE OR REPLACE FUNCTION refresh_public_event(p_event_id integer) RETURNS void AS $$
+    BEGIN
+        DELETE FROM public_events WHERE id = p_event_id;
+        PERFORM create_public_events_partition(
+            EXTRACT(YEAR FROM e.start_datetime)::integer
+        )
+        FROM events e
+        WHERE e.id = p_event_id AND e.status = 'approved'{not_archived};
+        INSERT INTO public_events (
+            id, organization_name, event_name, start_datetime, end_datetime,
+            maps_link, online, event_link, address, state, is_free, status,
+            version, tags, intl
+        )
+        SELECT
+            e.id, e.organization_name, e.event_name, e.start_datetime,
+            e.end_datetime, e.maps_link, e.online, e.event_link, e.address,
+            e.state, e.is_free, e.status, e.version,
+            COALESCE(
+                (
+                    SELECT array_agg(t.name ORDER BY et.id)
+                    FROM event_tags et
+                    JOIN tags t ON t.id = et.tag_id
+                    WHERE et.event_id = e.id
+                ),
+                '{{}}'
+            ),
+            COALESCE(
+                (
+                    SELECT jsonb_object_agg(
+                        i.lang,
+                        jsonb_build_object(
+                            'event_edition', i.event_edition,
+                            'cost', i.cost,
+                            'currency', i.currency,
+                            'banner_link', i.banner_link,
+                            'short_description', i.short_description
+                        )
+                    )
+                    FROM event_intl i
+                    WHERE i.event_id = e.id
+                ),
+                '{{}}'
+            )
+        FROM events e
+        WHERE e.id = p_event_id AND e.status = 'approved'{not_archived};
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+NOT_ARCHIVED = """
+          AND NOT EXISTS (
+              SELECT 1 FROM archived_event_years a
+              WHERE a.year = EXTRACT(YEAR FROM e.start_datetime)
+          )"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "archived_event_years",
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column(
+            "archived_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("year"),
+    )
+    # Years already archived: their partitions were renamed when detached
+    op.execute(
+        r"""
+        INSERT INTO archived_event_years (year)
+        SELECT substring(relname FROM '^public_events_([0-9]{4})_archived$')::integer
+        FROM pg_class
+        WHERE relname ~ '^public_events_[0-9]{4}_archived$' AND relkind = 'r'
+        """
+    )
+    # An event of an archived year stays out of public_events when written,
+    # instead of recreating the partition of its year
+    op.execute(REFRESH_PUBLIC_EVENT.format(not_archived=NOT_ARCHIVED))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(REFRESH_PUBLIC_EVENT.format(not_archived=""))
+    op.drop_table("archived_event_years")
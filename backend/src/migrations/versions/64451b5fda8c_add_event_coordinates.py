@@ -0,0 +1,64 @@
+"""add event coordinates
+
+Revision ID: 64451b5fda8c
+Revises: c74857ade86c
+Create Date: 2026-10-19 20:31:07.554129
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "64451b5fda8c"
+down_revision: Union[str, None] = "c74857ade86c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("events", "public_events"):
+        op.add_column(table, sa.Column("latitude", sa.Float(), nullable=True))
+        op.add_column(table, sa.Column("longitude", sa.Float(), nullable=True))
+        # "C" collation: prefix ranges must follow the geohash alphabet order
+        op.add_column(
+            table,
+            sa.Column("geohash", sa.String(collation="C"), nullable=True),
+        )
+    op.create_index("ix_public_events_geohash", "public_events", ["geohash"])
+
+    op.execute(
+        """
+        CREATE FUNCTION set_public_event_location() RETURNS trigger AS $$
+        BEGIN
+            SELECT e.latitude, e.longitude, e.geohash
+            INTO NEW.latitude, NEW.longitude, NEW.geohash
+            FROM events e
+            WHERE e.id = NEW.id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER public_events_location
+        BEFORE INSERT ON public_events
+        FOR EACH ROW EXECUTE FUNCTION set_public_event_location()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER public_events_location ON public_events")
+    op.execute("DROP FUNCTION set_public_event_location()")
+    op.drop_index("ix_public_events_geohash", table_name="public_events")
+    for table in ("public_events", "events"):
+        op.drop_column(table, "geohash")
+        op.drop_column(table, "longitude")
+        op.drop_column(table, "latitude")
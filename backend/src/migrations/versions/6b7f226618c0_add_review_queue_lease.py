@@ -0,0 +1,51 @@
+"""add review queue lease
+
+Revision ID: 6b7f226618c0
+Revises: 86d91b32b398
+Create Date: 2026-10-19 10:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6b7f226618c0"
+down_revision: Union[str, None] = "86d91b32b398"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "events",
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.add_column("events", sa.Column("claimed_by", sa.String(), nullable=True))
+    op.add_column("events", sa.Column("claimed_until", sa.DateTime(), nullable=True))
+    # Partial index: the pending queue stays tiny even as approved events grow,
+    # so counts and the oldest pending age are answered from the index alone.
+    op.create_index(
+        "ix_events_requested_created_at",
+        "events",
+        ["created_at"],
+        postgresql_include=["claimed_until"],
+        postgresql_where=sa.text("status = 'requested'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_events_requested_created_at", table_name="events")
+    op.drop_column("events", "claimed_until")
+    op.drop_column("events", "claimed_by")
+    op.drop_column("events", "created_at")
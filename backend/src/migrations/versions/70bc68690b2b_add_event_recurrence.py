@@ -0,0 +1,94 @@
+"""add event recurrence
+
+Revision ID: 70bc68690b2b
+Revises: 64451b5fda8c
+Create Date: 2026-10-19 21:14:52.318406
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "70bc68690b2b"
+down_revision: Union[str, None] = "64451b5fda8c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("events", "public_events"):
+        op.add_column(table, sa.Column("recurrence", sa.String(), nullable=True))
+        op.add_column(
+            table, sa.Column("recurrence_until", sa.DateTime(), nullable=True)
+        )
+    op.create_index(
+        "ix_public_events_series",
+        "public_events",
+        ["recurrence_until"],
+        postgresql_where=sa.text("recurrence IS NOT NULL"),
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION set_public_event_recurrence() RETURNS trigger AS $$
+        BEGIN
+            SELECT e.recurrence, e.recurrence_until
+            INTO NEW.recurrence, NEW.recurrence_until
+            FROM events e
+            WHERE e.id = NEW.id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER public_events_recurrence
+        BEFORE INSERT ON public_events
+        FOR EACH ROW EXECUTE FUNCTION set_public_event_recurrence()
+        """
+    )
+
+    # A series row stands for occurrences on other days: the calendar
+    # summary adds those when it is read, so the rollup skips series
+    op.execute("DROP TRIGGER public_events_day_rollup ON public_events")
+    op.execute(
+        """
+        CREATE TRIGGER public_events_day_rollup_insert
+        AFTER INSERT ON public_events
+        FOR EACH ROW WHEN (NEW.recurrence IS NULL)
+        EXECUTE FUNCTION update_event_day_rollup()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER public_events_day_rollup_delete
+        AFTER DELETE ON public_events
+        FOR EACH ROW WHEN (OLD.recurrence IS NULL)
+        EXECUTE FUNCTION update_event_day_rollup()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER public_events_day_rollup_delete ON public_events")
+    op.execute("DROP TRIGGER public_events_day_rollup_insert ON public_events")
+    op.execute(
+        """
+        CREATE TRIGGER public_events_day_rollup
+        AFTER INSERT OR DELETE ON public_events
+        FOR EACH ROW EXECUTE FUNCTION update_event_day_rollup()
+        """
+    )
+    op.execute("DROP TRIGGER public_events_recurrence ON public_events")
+    op.execute("DROP FUNCTION set_public_event_recurrence()")
+    op.drop_index("ix_public_events_series", table_name="public_events")
+    for table in ("public_events", "events"):
+        op.drop_column(table, "recurrence_until")
+        op.drop_column(table, "recurrence")
@@ -0,0 +1,46 @@
+"""leave events without a rate unpriced
+
+Revision ID: 7f5399c34e47
+Revises: d2b3b7e86b19
+Create Date: 2026-10-20 10:14:52.380164
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7f5399c34e47"
+down_revision: Union[str, None] = "d2b3b7e86b19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+EVENT_REFERENCE_PRICE = """
+    CREATE OR REPLACE FUNCTION event_reference_price(p_event_id integer)
+    RETURNS double precision AS $$
+        SELECT min(i.cost * {rate})
+        FROM event_intl i
+        {join} exchange_rates r ON r.currency = COALESCE(i.currency, 'BRL')
+        WHERE i.event_id = p_event_id
+    $$ LANGUAGE sql STABLE
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Taking a cost without a rate as BRL made 50 USD equal to 50 BRL. Such
+    # events get no reference price again, so price filters leave them out
+    # until their currency gets a rate.
+    op.execute(EVENT_REFERENCE_PRICE.format(rate="r.rate", join="JOIN"))
+    op.execute("UPDATE public_events SET reference_price = event_reference_price(id)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        EVENT_REFERENCE_PRICE.format(rate="COALESCE(r.rate, 1)", join="LEFT JOIN")
+    )
+    op.execute("UPDATE public_events SET reference_price = event_reference_price(id)")
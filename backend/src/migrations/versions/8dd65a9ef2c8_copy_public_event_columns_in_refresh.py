@@ -0,0 +1,150 @@
+"""copy public event columns in refresh
+
+Revision ID: 8dd65a9ef2c8
+Revises: 381055ffb876
+Create Date: 2026-10-20 11:47:05.662931
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8dd65a9ef2c8"
+down_revision: Union[str, None] = "381055ffb876"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+REFRESH_PUBLIC_EVENT = """
+    CREATE OR REPLACE FUNCTION refresh_public_event(p_event_id integer) RETURNS void AS $$
+    BEGIN
+        DELETE FROM public_events WHERE id = p_event_id;
+        PERFORM create_public_events_partition(
+            EXTRACT(YEAR FROM e.start_datetime)::integer
+        )
+        FROM events e
+        WHERE e.id = p_event_id AND e.status = 'approved'
+          AND NOT EXISTS (
+              SELECT 1 FROM archived_event_years a
+              WHERE a.year = EXTRACT(YEAR FROM e.start_datetime)
+          );
+        INSERT INTO public_events (
+            id, organization_name, event_name, start_datetime, end_datetime,
+            maps_link, online, event_link, address, state, is_free, status,
+            version, tags, intl{columns}
+        )
+        SELECT
+            e.id, e.organization_name, e.event_name, e.start_datetime,
+            e.end_datetime, e.maps_link, e.online, e.event_link, e.address,
+            e.state, e.is_free, e.status, e.version,
+            COALESCE(
+                (
+                    SELECT array_agg(t.name ORDER BY et.id)
+                    FROM event_tags et
+                    JOIN tags t ON t.id = et.tag_id
+                    WHERE et.event_id = e.id
+                ),
+                '{{}}'
+            ),
+            COALESCE(
+                (
+                    SELECT jsonb_object_agg(
+                        i.lang,
+                        jsonb_build_object(
+                            'event_edition', i.event_edition,
+                            'cost', i.cost,
+                            'currency', i.currency,
+                            'banner_link', i.banner_link,
+                            'short_description', i.short_description
+                        )
+                    )
+                    FROM event_intl i
+                    WHERE i.event_id = e.id
+                ),
+                '{{}}'
+            ){values}
+        FROM events e
+        WHERE e.id = p_event_id AND e.status = 'approved'
+          AND NOT EXISTS (
+              SELECT 1 FROM archived_event_years a
+              WHERE a.year = EXTRACT(YEAR FROM e.start_datetime)
+          );
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+COLUMNS = """,
+            latitude, longitude, geohash, recurrence, recurrence_until,
+            reference_price"""
+
+VALUES = """,
+            e.latitude, e.longitude, e.geohash, e.recurrence, e.recurrence_until,
+            event_reference_price(e.id)"""
+
+# The BEFORE INSERT triggers that filled these columns, each reading the
+# events row again
+COPY_TRIGGERS = {
+    "public_events_location": (
+        "set_public_event_location",
+        """
+        BEGIN
+            SELECT e.latitude, e.longitude, e.geohash
+            INTO NEW.latitude, NEW.longitude, NEW.geohash
+            FROM events e
+            WHERE e.id = NEW.id;
+            RETURN NEW;
+        END;
+        """,
+    ),
+    "public_events_recurrence": (
+        "set_public_event_recurrence",
+        """
+        BEGIN
+            SELECT e.recurrence, e.recurrence_until
+            INTO NEW.recurrence, NEW.recurrence_until
+            FROM events e
+            WHERE e.id = NEW.id;
+            RETURN NEW;
+        END;
+        """,
+    ),
+    "public_events_reference_price": (
+        "set_public_event_reference_price",
+        """
+        BEGIN
+            NEW.reference_price := event_reference_price(NEW.id);
+            RETURN NEW;
+        END;
+        """,
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # refresh_public_event already reads the events row: it copies these
+    # columns itself instead of one trigger per column group querying it again
+    op.execute(REFRESH_PUBLIC_EVENT.format(columns=COLUMNS, values=VALUES))
+    for trigger, (function, _) in COPY_TRIGGERS.items():
+        op.execute(f"DROP TRIGGER {trigger} ON public_events")
+        op.execute(f"DROP FUNCTION {function}()")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger, (function, body) in COPY_TRIGGERS.items():
+        op.execute(
+            f"CREATE FUNCTION {function}() RETURNS trigger AS $$"
+            f"{body}$$ LANGUAGE plpgsql"
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {trigger}
+            BEFORE INSERT ON public_events
+            FOR EACH ROW EXECUTE FUNCTION {function}()
+            """
+        )
+    op.execute(REFRESH_PUBLIC_EVENT.format(columns="", values=""))
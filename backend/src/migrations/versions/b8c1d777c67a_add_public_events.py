@@ -0,0 +1,128 @@
+"""add public events
+
+Revision ID: b8c1d777c67a
+Revises: 06d0a19b6360
+Create Date: 2026-10-19 15:02:13.448710
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8c1d777c67a"
+down_revision: Union[str, None] = "06d0a19b6360"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "public_events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("organization_name", sa.String(), nullable=False),
+        sa.Column("event_name", sa.String(), nullable=False),
+        sa.Column("start_datetime", sa.DateTime(), nullable=False),
+        sa.Column("end_datetime", sa.DateTime(), nullable=False),
+        sa.Column("maps_link", sa.String(), nullable=True),
+        sa.Column("online", sa.Boolean(), nullable=True),
+        sa.Column("event_link", sa.String(), nullable=True),
+        sa.Column("address", sa.String(), nullable=True),
+        sa.Column(
+            "state",
+            postgresql.ENUM(name="states", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("is_free", sa.Boolean(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="event_status", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "tags",
+            postgresql.ARRAY(sa.String()),
+            server_default="{}",
+            nullable=False,
+        ),
+        sa.Column(
+            "intl",
+            postgresql.JSONB(),
+            server_default="{}",
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["id"], ["events.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_public_events_start_datetime", "public_events", ["start_datetime"]
+    )
+    op.create_index("ix_public_events_state", "public_events", ["state"])
+    op.create_index(
+        "ix_public_events_tags", "public_events", ["tags"], postgresql_using="gin"
+    )
+
+    # Rebuilds the public row of one event from the normalized tables. Called
+    # by the services in the same transaction as every write to an event.
+    op.execute(
+        """
+        CREATE FUNCTION refresh_public_event(p_event_id integer) RETURNS void AS $$
+        BEGIN
+            DELETE FROM public_events WHERE id = p_event_id;
+            INSERT INTO public_events (
+                id, organization_name, event_name, start_datetime, end_datetime,
+                maps_link, online, event_link, address, state, is_free, status,
+                version, tags, intl
+            )
+            SELECT
+                e.id, e.organization_name, e.event_name, e.start_datetime,
+                e.end_datetime, e.maps_link, e.online, e.event_link, e.address,
+                e.state, e.is_free, e.status, e.version,
+                COALESCE(
+                    (
+                        SELECT array_agg(t.name ORDER BY et.id)
+                        FROM event_tags et
+                        JOIN tags t ON t.id = et.tag_id
+                        WHERE et.event_id = e.id
+                    ),
+                    '{}'
+                ),
+                COALESCE(
+                    (
+                        SELECT jsonb_object_agg(
+                            i.lang,
+                            jsonb_build_object(
+                                'event_edition', i.event_edition,
+                                'cost', i.cost,
+                                'currency', i.currency,
+                                'banner_link', i.banner_link,
+                                'short_description', i.short_description
+                            )
+                        )
+                        FROM event_intl i
+                        WHERE i.event_id = e.id
+                    ),
+                    '{}'
+                )
+            FROM events e
+            WHERE e.id = p_event_id AND e.status = 'approved';
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute("SELECT refresh_public_event(id) FROM events WHERE status = 'approved'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP FUNCTION refresh_public_event(integer)")
+    op.drop_index("ix_public_events_tags", table_name="public_events")
+    op.drop_index("ix_public_events_state", table_name="public_events")
+    op.drop_index("ix_public_events_start_datetime", table_name="public_events")
+    op.drop_table("public_events")
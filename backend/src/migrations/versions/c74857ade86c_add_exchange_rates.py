@@ -0,0 +1,124 @@
+"""add exchange rates
+
+Revision ID: c74857ade86c
+Revises: ca92a4ece216
+Create Date: 2026-10-19 19:48:30.902177
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c74857ade86c"
+down_revision: Union[str, None] = "ca92a4ece216"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "exchange_rates",
+        sa.Column(
+            "currency",
+            postgresql.ENUM(name="currencies", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("rate", sa.Float(), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.CheckConstraint("rate > 0", name="ck_exchange_rates_rate_positive"),
+        sa.PrimaryKeyConstraint("currency"),
+    )
+    # The reference currency; the others are set with `flask exchange-rate`
+    op.execute("INSERT INTO exchange_rates (currency, rate) VALUES ('BRL', 1)")
+
+    op.add_column(
+        "public_events", sa.Column("reference_price", sa.Float(), nullable=True)
+    )
+
+    # Lowest price of the event in the reference currency, NULL when it has
+    # no cost or its currency has no rate
+    op.execute(
+        """
+        CREATE FUNCTION event_reference_price(p_event_id integer)
+        RETURNS double precision AS $$
+            SELECT min(i.cost * r.rate)
+            FROM event_intl i
+            JOIN exchange_rates r ON r.currency = COALESCE(i.currency, 'BRL')
+            WHERE i.event_id = p_event_id
+        $$ LANGUAGE sql STABLE
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION set_public_event_reference_price() RETURNS trigger AS $$
+        BEGIN
+            NEW.reference_price := event_reference_price(NEW.id);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER public_events_reference_price
+        BEFORE INSERT ON public_events
+        FOR EACH ROW EXECUTE FUNCTION set_public_event_reference_price()
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION reprice_public_events() RETURNS trigger AS $$
+        DECLARE
+            changed currencies[];
+        BEGIN
+            IF TG_OP <> 'DELETE' THEN
+                changed := changed || NEW.currency;
+            END IF;
+            IF TG_OP <> 'INSERT' THEN
+                changed := changed || OLD.currency;
+            END IF;
+
+            UPDATE public_events p
+            SET reference_price = event_reference_price(p.id)
+            WHERE EXISTS (
+                SELECT 1 FROM event_intl i
+                WHERE i.event_id = p.id
+                  AND COALESCE(i.currency, 'BRL') = ANY (changed)
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER exchange_rates_reprice
+        AFTER INSERT OR UPDATE OR DELETE ON exchange_rates
+        FOR EACH ROW EXECUTE FUNCTION reprice_public_events()
+        """
+    )
+
+    op.execute("UPDATE public_events SET reference_price = event_reference_price(id)")
+    op.create_index(
+        "ix_public_events_reference_price", "public_events", ["reference_price"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_public_events_reference_price", table_name="public_events")
+    op.execute("DROP TRIGGER exchange_rates_reprice ON exchange_rates")
+    op.execute("DROP FUNCTION reprice_public_events()")
+    op.execute("DROP TRIGGER public_events_reference_price ON public_events")
+    op.execute("DROP FUNCTION set_public_event_reference_price()")
+    op.execute("DROP FUNCTION event_reference_price(integer)")
+    op.drop_column("public_events", "reference_price")
+    op.drop_table("exchange_rates")
@@ -0,0 +1,50 @@
+"""add public events period
+
+Revision ID: ca92a4ece216
+Revises: 1c0b5c35f0a1
+Create Date: 2026-10-19 19:05:12.318406
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ca92a4ece216"
+down_revision: Union[str, None] = "1c0b5c35f0a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GREATEST: an event whose end was entered before its start still gets a
+    # valid (empty-length) range instead of failing the refresh
+    op.add_column(
+        "public_events",
+        sa.Column(
+            "period",
+            postgresql.TSRANGE(),
+            sa.Computed(
+                "tsrange(start_datetime, GREATEST(start_datetime, end_datetime), '[]')",
+                persisted=True,
+            ),
+            nullable=False,
+        ),
+    )
+    op.create_index(
+        "ix_public_events_period",
+        "public_events",
+        ["period"],
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_public_events_period", table_name="public_events")
+    op.drop_column("public_events", "period")
@@ -0,0 +1,45 @@
+"""price events without a rate
+
+Revision ID: d2b3b7e86b19
+Revises: 15f4d8619be1
+Create Date: 2026-10-19 22:58:41.206395
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2b3b7e86b19"
+down_revision: Union[str, None] = "15f4d8619be1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+EVENT_REFERENCE_PRICE = """
+    CREATE OR REPLACE FUNCTION event_reference_price(p_event_id integer)
+    RETURNS double precision AS $$
+        SELECT min(i.cost * {rate})
+        FROM event_intl i
+        {join} exchange_rates r ON r.currency = COALESCE(i.currency, 'BRL')
+        WHERE i.event_id = p_event_id
+    $$ LANGUAGE sql STABLE
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A cost in a currency without a rate is taken as it is, instead of
+    # leaving the event out of every price filter
+    op.execute(
+        EVENT_REFERENCE_PRICE.format(rate="COALESCE(r.rate, 1)", join="LEFT JOIN")
+    )
+    op.execute("UPDATE public_events SET reference_price = event_reference_price(id)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(EVENT_REFERENCE_PRICE.format(rate="r.rate", join="JOIN"))
+    op.execute("UPDATE public_events SET reference_price = event_reference_price(id)")
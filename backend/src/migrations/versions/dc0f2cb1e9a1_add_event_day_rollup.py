@@ -0,0 +1,94 @@
+"""add event day rollup
+
+Revision ID: dc0f2cb1e9a1
+Revises: ea7bb035e46c
+Create Date: 2026-10-19 17:26:08.301157
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "dc0f2cb1e9a1"
+down_revision: Union[str, None] = "ea7bb035e46c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# One row per (dimension, value) an event counts towards; 'total' counts it once
+EVENT_DIMENSIONS = """
+    SELECT 'total', ''
+    UNION ALL SELECT 'state', {row}.state::text
+    UNION ALL SELECT 'online', COALESCE({row}.online, false)::text
+    UNION ALL SELECT 'tag', tag FROM unnest({row}.tags) AS tag
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "event_day_rollup",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("dimension", sa.String(), nullable=False),
+        sa.Column("value", sa.String(), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "dimension", "value"),
+    )
+
+    # refresh_public_event deletes and re-inserts the public row on every
+    # write, so counting inserts up and deletes down keeps the rollup exact.
+    op.execute(
+        f"""
+        CREATE FUNCTION update_event_day_rollup() RETURNS trigger AS $$
+        DECLARE
+            changed public_events;
+            delta integer;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                changed := NEW;
+                delta := 1;
+            ELSE
+                changed := OLD;
+                delta := -1;
+            END IF;
+
+            INSERT INTO event_day_rollup (day, dimension, value, event_count)
+            SELECT changed.start_datetime::date, d.dimension, d.value, delta
+            FROM ({EVENT_DIMENSIONS.format(row="changed")}) AS d(dimension, value)
+            ON CONFLICT (day, dimension, value) DO UPDATE
+            SET event_count = event_day_rollup.event_count + EXCLUDED.event_count;
+
+            DELETE FROM event_day_rollup
+            WHERE day = changed.start_datetime::date AND event_count <= 0;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER public_events_day_rollup
+        AFTER INSERT OR DELETE ON public_events
+        FOR EACH ROW EXECUTE FUNCTION update_event_day_rollup()
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO event_day_rollup (day, dimension, value, event_count)
+        SELECT p.start_datetime::date, d.dimension, d.value, count(*)
+        FROM public_events p,
+        LATERAL ({EVENT_DIMENSIONS.format(row="p")}) AS d(dimension, value)
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER public_events_day_rollup ON public_events")
+    op.execute("DROP FUNCTION update_event_day_rollup()")
+    op.drop_table("event_day_rollup")
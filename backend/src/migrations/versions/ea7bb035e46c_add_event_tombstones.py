@@ -0,0 +1,86 @@
+"""add event tombstones
+
+Revision ID: ea7bb035e46c
+Revises: b8c1d777c67a
+Create Date: 2026-10-19 16:41:27.915204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ea7bb035e46c"
+down_revision: Union[str, None] = "b8c1d777c67a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "event_tombstones",
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "deleted_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("event_id"),
+    )
+    op.create_index("ix_event_tombstones_version", "event_tombstones", ["version"])
+    op.create_index("ix_public_events_version", "public_events", ["version"])
+
+    # An event leaving public_events (declined, unapproved or deleted, through
+    # the cascade) leaves a tombstone; coming back removes it. refresh_public_event
+    # deletes and re-inserts on every write, so updates leave no tombstone behind.
+    op.execute(
+        """
+        CREATE FUNCTION record_event_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO event_tombstones (event_id, version)
+            VALUES (OLD.id, nextval('events_version_seq'))
+            ON CONFLICT (event_id) DO UPDATE
+            SET version = EXCLUDED.version, deleted_at = now();
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION clear_event_tombstone() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM event_tombstones WHERE event_id = NEW.id;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER public_events_record_tombstone
+        AFTER DELETE ON public_events
+        FOR EACH ROW EXECUTE FUNCTION record_event_tombstone()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER public_events_clear_tombstone
+        AFTER INSERT ON public_events
+        FOR EACH ROW EXECUTE FUNCTION clear_event_tombstone()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER public_events_clear_tombstone ON public_events")
+    op.execute("DROP TRIGGER public_events_record_tombstone ON public_events")
+    op.execute("DROP FUNCTION clear_event_tombstone()")
+    op.execute("DROP FUNCTION record_event_tombstone()")
+    op.drop_index("ix_public_events_version", table_name="public_events")
+    op.drop_index("ix_event_tombstones_version", table_name="event_tombstones")
+    op.drop_table("event_tombstones")
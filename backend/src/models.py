@@ -1,9 +1,17 @@
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import Enum
+from sqlalchemy import Enum, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSRANGE
+from sqlalchemy.orm import deferred
 
 import enum
+import uuid
 
-db = SQLAlchemy()
+from src.services.replica import ReplicaRoutingSession
+
+db = SQLAlchemy(session_options={"class_": ReplicaRoutingSession})
+
+# Bumped on every write to an event, lets in-memory copies refresh only what changed
+events_version_seq = db.Sequence("events_version_seq", metadata=db.metadata)
 
 
 class EventStatus(enum.Enum):
@@ -12,6 +20,13 @@ class EventStatus(enum.Enum):
     declined = "declined"
 
 
+class SubmissionStatus(enum.Enum):
+    queued = "queued"
+    accepted = "accepted"
+    rejected = "rejected"
+    failed = "failed"
+
+
 class States(enum.Enum):
     AP = "AP"
     AM = "AM"
@@ -49,7 +64,52 @@ class Currency(enum.Enum):
     CAD = "CAD"  # Canadian Dollar
 
 
-class Event(db.Model):
+EVENT_FIELDS = (
+    "id",
+    "organization_name",
+    "event_name",
+    "start_datetime",
+    "end_datetime",
+    "recurrence",
+    "address",
+    "state",
+    "maps_link",
+    "latitude",
+    "longitude",
+    "online",
+    "is_free",
+    "event_link",
+    "status",
+    "tags",
+    "intl",
+)
+
+
+class SerializedEventMixin:
+    """JSON shape shared by ``Event`` and ``PublicEvent``."""
+
+    @property
+    def serialized(self):
+        return self.serialize()
+
+    def serialize(self, fields: tuple[str, ...] | None = None) -> dict:
+        """Touch only the attributes in ``fields`` so deferred columns stay unloaded."""
+        return {name: self._serialize_field(name) for name in fields or EVENT_FIELDS}
+
+    def _serialize_field(self, name: str):
+        if name == "tags":
+            return self._serialized_tags()
+        if name == "intl":
+            return self._serialized_intl()
+        value = getattr(self, name)
+        if name in ("start_datetime", "end_datetime"):
+            return value.isoformat()
+        if name in ("state", "status"):
+            return value.value
+        return value
+
+
+class Event(SerializedEventMixin, db.Model):
     __tablename__ = "events"
 
     id = db.Column(db.Integer, primary_key=True)
@@ -57,7 +117,15 @@ class Event(db.Model):
     event_name = db.Column(db.String, nullable=False)
     start_datetime = db.Column(db.DateTime, nullable=False)
     end_datetime = db.Column(db.DateTime, nullable=False)
+    # RRULE of a recurring event, see src/services/recurrence.py
+    recurrence = db.Column(db.String)
+    # End of the last occurrence, NULL when the series never ends
+    recurrence_until = db.Column(db.DateTime)
     maps_link = db.Column(db.String)
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+    # Of latitude/longitude, for proximity search (see src/services/geo.py)
+    geohash = db.Column(db.String(collation="C"))
     online = db.Column(db.Boolean, default=False)
     event_link = db.Column(db.String)
 
@@ -77,38 +145,206 @@ class Event(db.Model):
         default=EventStatus.requested,
     )
 
+    created_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
+
+    version = db.Column(
+        db.BigInteger,
+        nullable=False,
+        server_default=events_version_seq.next_value(),
+        index=True,
+    )
+
+    # Review queue lease, see src/services/review.py
+    claimed_by = db.Column(db.String)
+    claimed_until = db.Column(db.DateTime)
+
     intl = db.relationship("EventIntl", backref="event", cascade="all, delete")
     tags = db.relationship("Tag", secondary="event_tags", back_populates="events")
 
-    @property
-    def serialized(self):
+    __table_args__ = (
+        db.Index(
+            "ix_events_requested_created_at",
+            "created_at",
+            postgresql_include=["claimed_until"],
+            postgresql_where=db.text("status = 'requested'"),
+        ),
+    )
+
+    def _serialized_tags(self):
+        return [t.name for t in self.tags]
+
+    def _serialized_intl(self):
         return {
-            "id": self.id,
-            "organization_name": self.organization_name,
-            "event_name": self.event_name,
-            "start_datetime": self.start_datetime.isoformat(),
-            "end_datetime": self.end_datetime.isoformat(),
-            "address": self.address,
-            "state": self.state.value,
-            "maps_link": self.maps_link,
-            "online": self.online,
-            "is_free": self.is_free,
-            "event_link": self.event_link,
-            "status": self.status.value,
-            "tags": [t.name for t in self.tags],
-            "intl": {
-                intl.lang: {
-                    "event_edition": intl.event_edition,
-                    "cost": intl.cost,
-                    "currency": intl.currency.value if intl.currency else None,
-                    "banner_link": intl.banner_link,
-                    "short_description": intl.short_description,
-                }
-                for intl in self.intl
-            },
+            intl.lang: {
+                "event_edition": intl.event_edition,
+                "cost": intl.cost,
+                "currency": intl.currency.value if intl.currency else None,
+                "banner_link": intl.banner_link,
+                "short_description": intl.short_description,
+            }
+            for intl in self.intl
         }
 
 
+class PublicEvent(SerializedEventMixin, db.Model):
+    """
+    Denormalized copy of an approved event: tags as an array, intl as JSONB.
+
+    Maintained row by row by the ``refresh_public_event`` SQL function, which
+    the event services call in the same transaction as each write. Public
+    reads use it to avoid joining ``event_intl``, ``event_tags`` and ``tags``.
+
+    Partitioned by start year (``public_events_<year>``), so date-bounded
+    reads only scan the years they cover. The table's primary key is
+    ``(id, start_datetime)``, as Postgres requires; ``id`` alone is still
+    unique, and is what the ORM uses as the identity.
+    """
+
+    __tablename__ = "public_events"
+
+    id = db.Column(
+        db.Integer, db.ForeignKey("events.id", ondelete="CASCADE"), primary_key=True
+    )
+    organization_name = db.Column(db.String, nullable=False)
+    event_name = db.Column(db.String, nullable=False)
+    start_datetime = db.Column(db.DateTime, nullable=False, index=True)
+    end_datetime = db.Column(db.DateTime, nullable=False)
+    # Copied from events by a trigger on insert, like the location below
+    recurrence = db.Column(db.String)
+    recurrence_until = db.Column(db.DateTime)
+    maps_link = db.Column(db.String)
+    # Copied from events by a trigger on insert
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+    geohash = db.Column(db.String(collation="C"), index=True)
+    online = db.Column(db.Boolean)
+    event_link = db.Column(db.String)
+    address = db.Column(db.String)
+    state = db.Column(db.Enum(States, name="states"), nullable=False, index=True)
+    is_free = db.Column(db.Boolean, nullable=False)
+    status = db.Column(Enum(EventStatus, name="event_status"), nullable=False)
+    version = db.Column(db.BigInteger, nullable=False, index=True)
+    tags = db.Column(ARRAY(db.String), nullable=False, server_default="{}")
+    intl = db.Column(JSONB, nullable=False, server_default="{}")
+    # Lowest cost in REFERENCE_CURRENCY, kept by triggers on insert and on
+    # exchange_rates changes; NULL for free events or currencies without a rate
+    reference_price = db.Column(db.Float, index=True)
+    # [start, end] as one value, for overlap queries on its GiST index
+    period = deferred(
+        db.Column(
+            TSRANGE,
+            db.Computed(
+                "tsrange(start_datetime, GREATEST(start_datetime, end_datetime), '[]')",
+                persisted=True,
+            ),
+            nullable=False,
+        )
+    )
+
+    __table_args__ = (
+        db.Index("ix_public_events_tags", "tags", postgresql_using="gin"),
+        db.Index("ix_public_events_period", "period", postgresql_using="gist"),
+        db.Index(
+            "ix_public_events_series",
+            "recurrence_until",
+            postgresql_where=db.text("recurrence IS NOT NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (start_datetime)"},
+    )
+
+    def _serialized_tags(self):
+        return list(self.tags)
+
+    def _serialized_intl(self):
+        return self.intl
+
+
+class EventTombstone(db.Model):
+    """
+    An event that left ``public_events`` (declined or deleted).
+
+    Written by a trigger on ``public_events``, and stamped like its rows with a
+    fresh ``events_version_seq`` value at commit, so deletes show up in the
+    change feed in version order.
+    """
+
+    __tablename__ = "event_tombstones"
+
+    event_id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, index=True)
+    deleted_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
+
+
+class EventDayRollup(db.Model):
+    """
+    Approved events per start day, counted by tag, state and online.
+
+    Kept up to date by a trigger on ``public_events``; the ``total`` dimension
+    counts every event once, with an empty ``value``.
+    """
+
+    __tablename__ = "event_day_rollup"
+
+    day = db.Column(db.Date, primary_key=True)
+    dimension = db.Column(db.String, primary_key=True)
+    value = db.Column(db.String, primary_key=True)
+    event_count = db.Column(db.Integer, nullable=False)
+
+
+class ArchivedEventYear(db.Model):
+    """
+    A start year whose ``public_events`` partition was archived.
+
+    ``refresh_public_event`` leaves events of these years out of
+    ``public_events``, so editing one does not bring its year back.
+    """
+
+    __tablename__ = "archived_event_years"
+
+    year = db.Column(db.Integer, primary_key=True)
+    archived_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
+
+
+class EventCounter(db.Model):
+    """
+    Views of an approved event's page and clicks on its link.
+
+    Counted in memory by each worker and added here in bulk, see
+    src/services/counters.py. ``score`` orders ``sort=popular``.
+    """
+
+    __tablename__ = "event_counters"
+
+    event_id = db.Column(
+        db.Integer, db.ForeignKey("events.id", ondelete="CASCADE"), primary_key=True
+    )
+    views = db.Column(db.BigInteger, nullable=False, server_default="0")
+    clicks = db.Column(db.BigInteger, nullable=False, server_default="0")
+    score = db.Column(
+        db.BigInteger,
+        db.Computed("views + 5 * clicks", persisted=True),
+        nullable=False,
+        index=True,
+    )
+    updated_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
+
+
+class ExchangeRate(db.Model):
+    """Value of one unit of ``currency`` in ``REFERENCE_CURRENCY``."""
+
+    __tablename__ = "exchange_rates"
+
+    currency = db.Column(db.Enum(Currency, name="currencies"), primary_key=True)
+    rate = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(
+        db.DateTime, nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        db.CheckConstraint("rate > 0", name="ck_exchange_rates_rate_positive"),
+    )
+
+
 class EventIntl(db.Model):
     __tablename__ = "event_intl"
 
@@ -145,3 +381,51 @@ class EventTag(db.Model):
     )
 
     __table_args__ = (db.UniqueConstraint("event_id", "tag_id"),)
+
+
+class EventSubmission(db.Model):
+    __tablename__ = "event_submissions"
+
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    payload = db.Column(JSONB, nullable=False)
+    status = db.Column(
+        Enum(SubmissionStatus, name="submission_status"),
+        nullable=False,
+        default=SubmissionStatus.queued,
+    )
+    error = db.Column(db.String)
+    event_id = db.Column(db.Integer, db.ForeignKey("events.id", ondelete="SET NULL"))
+    created_at = db.Column(db.DateTime, nullable=False, server_default=func.now())
+    processed_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index(
+            "ix_event_submissions_queued_created_at",
+            "created_at",
+            postgresql_where=db.text("status = 'queued'"),
+        ),
+    )
+
+    @property
+    def serialized(self):
+        return {
+            "id": self.id,
+            "status": self.status.value,
+            "error": self.error,
+            "event_id": self.event_id,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "processed_at": (
+                self.processed_at.isoformat() if self.processed_at else None
+            ),
+        }
+
+
+class RateLimitBucket(db.Model):
+    __tablename__ = "rate_limit_buckets"
+    # Buckets are disposable, skipping the WAL keeps the per-request upsert cheap.
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key = db.Column(db.String, primary_key=True)
+    tokens = db.Column(db.Float, nullable=False)
+    allowed = db.Column(db.Boolean, nullable=False)
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False)
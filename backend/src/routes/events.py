@@ -1,28 +1,72 @@
+import json
 import logging
 import os
+import queue
 from flask_cors import cross_origin
 
-from flask import jsonify
+from flask import Response, current_app, jsonify, redirect, request
 from flask_openapi3 import Tag, APIBlueprint
 
-from src.exceptions import DuplicateEventException, EventNotFoundException
+from src.constants import (
+    ASYNC_SUBMISSIONS,
+    SUBMIT_RATE_LIMIT_CAPACITY,
+    STREAM_HEARTBEAT_SECONDS,
+    SUBMIT_RATE_LIMIT_REFILL_PER_SECOND,
+)
+from src.exceptions import (
+    DuplicateEventException,
+    EventNotFoundException,
+    ReviewClaimConflictException,
+    StreamUnavailableException,
+)
 from src.models import EventStatus
 from src.schemas import (
+    CalendarQuery,
+    EventBatchBody,
+    EventBatchQuery,
+    EventChangesQuery,
+    EventProjectionQuery,
     EventIn,
     EventQuery,
     ManageSubmittedEventBody,
+    RelatedEventsQuery,
     SubmittedActions,
     EventUpdate,
     EventPath,
+    ReviewClaimBody,
+    ReviewReleaseBody,
+    SubmissionPath,
 )
 from src.services.auth import check_credentials
+from src.services.columnar import (
+    COLUMNAR_JSON_MIMETYPE,
+    MSGPACK_MIMETYPE,
+    pack_msgpack,
+    to_columnar,
+)
+from src.services.counters import record_click, record_view
+from src.services.event_stream import event_broadcaster
+from src.services.rate_limit import rate_limited
+from src.services.related import get_related_events
+from src.services.review import (
+    claim_pending_events,
+    release_claim,
+    get_review_queue_stats,
+)
 from src.services.event import (
     submit_event,
     get_events as get_events_service,
     get_event as get_event_service,
+    get_public_event,
+    get_event_link,
+    get_events_by_ids,
+    get_changes,
+    get_facets,
     delete_event as delete_event_service,
     update_event_status,
     get_events_calendar,
+    enqueue_submission,
+    get_submission,
 )
 from src.services.event import update_event as update_event_service
 
@@ -61,6 +105,14 @@ def get_allowed_origins():
     return origins
 
 
+def resolve_language(query: EventProjectionQuery) -> None:
+    """Replace ``lang=auto`` with the preferred language from Accept-Language."""
+    if query.lang == "auto":
+        query.lang = next(
+            (lang for lang in request.accept_languages.values() if lang != "*"), None
+        )
+
+
 # TODO: remove this double route
 @event_bp.get(
     "",
@@ -74,8 +126,36 @@ def get_allowed_origins():
 )
 @cross_origin(origins="*")
 def get_events(query: EventQuery):
+    resolve_language(query)
     events = get_events_service(query)
-    return jsonify(events), 200
+    headers = {"Vary": "Accept, Accept-Language"}
+
+    # JSON stays first so */* and missing Accept headers keep the object list
+    mimetype = request.accept_mimetypes.best_match(
+        ["application/json", COLUMNAR_JSON_MIMETYPE, MSGPACK_MIMETYPE],
+        default="application/json",
+    )
+    if mimetype == COLUMNAR_JSON_MIMETYPE:
+        response = jsonify(to_columnar(events))
+        response.mimetype = COLUMNAR_JSON_MIMETYPE
+        return response, 200, headers
+    if mimetype == MSGPACK_MIMETYPE:
+        return (
+            Response(pack_msgpack(to_columnar(events)), mimetype=mimetype),
+            200,
+            headers,
+        )
+    return jsonify(events), 200, headers
+
+
+@event_bp.get(
+    "/facets",
+    tags=[public_tag],
+    summary="Count matching events per tag, state, online and price option",
+)
+@cross_origin(origins="*")
+def get_events_facets(query: EventQuery):
+    return jsonify(get_facets(query)), 200
 
 
 @event_bp.get(
@@ -84,9 +164,126 @@ def get_events(query: EventQuery):
     summary="Retrieve event",
 )
 @cross_origin(origins="*")
-def get_event(path: EventPath):
-    event = get_event_service(path.event_id)
-    return jsonify(event.serialized), 200
+def get_event(path: EventPath, query: EventProjectionQuery):
+    resolve_language(query)
+    event = get_public_event(path.event_id, query)
+    record_view(path.event_id)
+    return jsonify(event), 200, {"Vary": "Accept-Language"}
+
+
+@event_bp.get(
+    "/<int:event_id>/related",
+    tags=[public_tag],
+    summary="Retrieve upcoming events related to an event",
+    description="Upcoming approved events with the most similar tags, rare tags "
+    "weighing more than common ones, most similar first.",
+)
+@cross_origin(origins="*")
+def get_event_related(path: EventPath, query: RelatedEventsQuery):
+    resolve_language(query)
+    try:
+        events = get_related_events(path.event_id, query.limit, query)
+    except EventNotFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    return jsonify(events), 200, {"Vary": "Accept-Language"}
+
+
+@event_bp.get(
+    "/<int:event_id>/link",
+    tags=[public_tag],
+    summary="Open the event link",
+    description="Redirects to the `event_link` of an approved event, counting "
+    "the click for `sort=popular`. Only http and https links are followed.",
+)
+@cross_origin(origins="*")
+def open_event_link(path: EventPath):
+    try:
+        event_link = get_event_link(path.event_id)
+    except EventNotFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    if not event_link:
+        return jsonify({"error": "Event has no link."}), 404
+
+    record_click(path.event_id)
+    return redirect(event_link, code=302)
+
+
+@event_bp.get(
+    "/batch",
+    tags=[public_tag],
+    summary="Retrieve several events by ID",
+)
+@cross_origin(origins="*")
+def get_events_batch(query: EventBatchQuery):
+    resolve_language(query)
+    events, missing = get_events_by_ids(query.parsed_ids, query)
+    return (
+        jsonify({"events": events, "missing": missing}),
+        200,
+        {"Vary": "Accept-Language"},
+    )
+
+
+@event_bp.post(
+    "/batch",
+    tags=[public_tag],
+    summary="Retrieve several events by ID (IDs in the body)",
+)
+@cross_origin(origins="*")
+def post_events_batch(body: EventBatchBody, query: EventProjectionQuery):
+    resolve_language(query)
+    events, missing = get_events_by_ids(body.ids, query)
+    return (
+        jsonify({"events": events, "missing": missing}),
+        200,
+        {"Vary": "Accept-Language"},
+    )
+
+
+@event_bp.get(
+    "/changes",
+    tags=[public_tag],
+    summary="Public events changed since a version",
+)
+@cross_origin(origins="*")
+def get_events_changes(query: EventChangesQuery):
+    resolve_language(query)
+    changes = get_changes(query.since, query.limit, query)
+    return jsonify(changes), 200, {"Vary": "Accept-Language"}
+
+
+@event_bp.get(
+    "/stream",
+    tags=[public_tag],
+    summary="Server-Sent Events stream of approved, updated and removed events",
+)
+@cross_origin(origins="*")
+def get_events_stream():
+    try:
+        subscriber = event_broadcaster.subscribe(current_app._get_current_object())
+    except StreamUnavailableException as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "30"}
+
+    def stream():
+        try:
+            while True:
+                try:
+                    message = subscriber.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    # Keeps proxies from closing the idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield f"event: {message['change']}\ndata: {json.dumps(message)}\n\n"
+        finally:
+            event_broadcaster.unsubscribe(subscriber)
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @event_bp.post(
@@ -95,7 +292,16 @@ def get_event(path: EventPath):
     summary="Submit event for review",
 )
 @cross_origin(origins="*")
+@rate_limited("submit", SUBMIT_RATE_LIMIT_CAPACITY, SUBMIT_RATE_LIMIT_REFILL_PER_SECOND)
 def create_event(body: EventIn):
+    if ASYNC_SUBMISSIONS:
+        submission = enqueue_submission(body)
+        return (
+            jsonify(submission.serialized),
+            202,
+            {"Location": f"/events/submit/status/{submission.id}"},
+        )
+
     try:
         event = submit_event(body)
     except DuplicateEventException as e:
@@ -103,6 +309,20 @@ def create_event(body: EventIn):
     return jsonify(event.serialized), 201
 
 
+@event_bp.get(
+    "/submit/status/<string:submission_id>",
+    tags=[submission_tag],
+    summary="Check the outcome of a queued submission",
+)
+@cross_origin(origins="*")
+def get_submission_status(path: SubmissionPath):
+    try:
+        submission = get_submission(path.submission_id)
+    except EventNotFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    return jsonify(submission.serialized), 200
+
+
 @event_bp.delete(
     "/<int:event_id>",
     tags=[review_tag],
@@ -153,6 +373,58 @@ def get_pending_events():
         return jsonify({"error": "Internal server error"}), 500
 
 
+@event_bp.post(
+    "/submit/review/claim",
+    tags=[review_tag],
+    summary="Claim a batch of pending events",
+    description="Leases up to `limit` pending events to the moderator. Events leased "
+    "to someone else are skipped until their lease expires. Leases are advisory: "
+    "any management token can claim or release under any moderator name, and "
+    "approving or rejecting an event does not check who holds it.",
+)
+def claim_pending(body: ReviewClaimBody):
+    is_valid_credentials = check_credentials()
+    if is_valid_credentials:
+        return is_valid_credentials
+
+    events = claim_pending_events(body.moderator, body.limit, body.lease_seconds)
+    return jsonify(events), 200
+
+
+@event_bp.post(
+    "/submit/review/<int:event_id>/release",
+    tags=[review_tag],
+    summary="Release a claimed event back to the queue",
+)
+def release_pending(path: EventPath, body: ReviewReleaseBody):
+    is_valid_credentials = check_credentials()
+    if is_valid_credentials:
+        return is_valid_credentials
+
+    try:
+        release_claim(path.event_id, body.moderator)
+        return jsonify({"message": "Claim released"}), 200
+    except EventNotFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    except ReviewClaimConflictException as e:
+        return jsonify({"error": str(e)}), 409
+
+
+@event_bp.get(
+    "/submit/review/stats",
+    tags=[review_tag],
+    summary="Review queue statistics",
+    description="Pending, claimed and unclaimed counts plus the age of the oldest "
+    "pending event.",
+)
+def review_queue_stats():
+    is_valid_credentials = check_credentials()
+    if is_valid_credentials:
+        return is_valid_credentials
+
+    return jsonify(get_review_queue_stats()), 200
+
+
 @event_bp.post(
     "/submit/<int:event_id>",
     tags=[review_tag],
@@ -181,9 +453,10 @@ def manage_submitted_update_event(path: EventPath, body: ManageSubmittedEventBod
     "/calendar",
     tags=[public_tag],
     summary="Retrieve dates with events",
-    description="Returns a list of dates that have events and their respective event IDs.",
+    description="Returns a list of dates that have events and their respective event IDs, "
+    "or per-day counts by tag, state and online with summary=true.",
 )
 @cross_origin(origins="*")
-def get_calendar():
-    calendar_data = get_events_calendar()
+def get_calendar(query: CalendarQuery):
+    calendar_data = get_events_calendar(query.date_from, query.date_to, query.summary)
     return jsonify(calendar_data), 200
@@ -0,0 +1,25 @@
+from flask import jsonify
+from flask_cors import cross_origin
+from flask_openapi3 import APIBlueprint, Tag
+
+from src.schemas import SuggestQuery
+from src.services.suggest import suggest
+
+suggest_bp = APIBlueprint("suggest", __name__, url_prefix="/suggest")
+suggest_tag = Tag(
+    name="Suggestions",
+    description="Typeahead for the search and submission forms.",
+)
+
+
+@suggest_bp.get(
+    "",
+    tags=[suggest_tag],
+    summary="Suggest tags, organizations and event names",
+    description="Values with a word starting with `q`, ignoring accents and case, "
+    "ranked by their number of approved events.",
+)
+@cross_origin(origins="*")
+def get_suggestions(query: SuggestQuery):
+    kind = query.kind.value if query.kind else None
+    return jsonify(suggest(query.q, kind, query.limit)), 200
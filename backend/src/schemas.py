@@ -1,13 +1,87 @@
 import enum
-from datetime import datetime
-from pydantic import BaseModel, Field
+from datetime import date, datetime
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import Optional, List, Dict
 
-from src.models import States, Currency
+from src.constants import (
+    CHANGES_MAX_PAGE_SIZE,
+    CHANGES_PAGE_SIZE,
+    DEFAULT_LANGUAGE,
+    EVENTS_BATCH_MAX_IDS,
+    NEAR_DEFAULT_RADIUS_KM,
+    NEAR_MAX_RADIUS_KM,
+    RELATED_DEFAULT_LIMIT,
+    RELATED_MAX_LIMIT,
+    SUPPORTED_LANGUAGES,
+    REVIEW_CLAIM_BATCH_SIZE,
+    REVIEW_CLAIM_MAX_BATCH_SIZE,
+    REVIEW_LEASE_SECONDS,
+    SUGGEST_DEFAULT_LIMIT,
+    SUGGEST_MAX_LIMIT,
+)
+from src.models import EVENT_FIELDS, States, Currency
+from src.services.recurrence import last_end, normalize_rule
 
 
-class EventQuery(BaseModel):
+class TagsMode(enum.Enum):
+    any = "any"
+    all = "all"
+
+
+class DateRangeMode(enum.Enum):
+    contained = "contained"
+    overlaps = "overlaps"
+
+
+class EventSort(enum.Enum):
+    start = "start"
+    popular = "popular"
+
+
+class EventProjectionQuery(BaseModel):
+    fields: str | None = Field(
+        None, description="Comma-separated list of event fields to return"
+    )
+
+    lang: str | None = Field(
+        None,
+        description="Return only this intl language (e.g. pt-br), falling back to "
+        "the default language. 'auto' picks it from Accept-Language",
+    )
+
+    @field_validator("fields")
+    @classmethod
+    def check_fields(cls, fields: str | None) -> str | None:
+        if fields:
+            requested = {f.strip() for f in fields.split(",") if f.strip()}
+            unknown = requested - set(EVENT_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return fields
+
+    @property
+    def parsed_fields(self) -> tuple[str, ...] | None:
+        """Requested fields in response order, ``id`` is always included."""
+        if not self.fields:
+            return None
+        requested = {f.strip() for f in self.fields.split(",")} | {"id"}
+        return tuple(f for f in EVENT_FIELDS if f in requested)
+
+    @property
+    def language_chain(self) -> tuple[str, ...] | None:
+        """Languages to try for ``intl``, in order, when ``lang`` is set."""
+        if not self.lang or self.lang == "auto":
+            return None
+        chain = (self.lang.strip().lower(), DEFAULT_LANGUAGE, *SUPPORTED_LANGUAGES)
+        return tuple(dict.fromkeys(chain))
+
+
+class EventQuery(EventProjectionQuery):
     tags: str | None = Field(default=None, description="Comma-separated list of tags")
+    tags_mode: Optional[TagsMode] = Field(
+        None,
+        description="Match events with any of the tags (default) or with all of them",
+    )
     name: str | None = Field(None, description="Filter by event name")
     org: str | None = Field(None, description="Filter by organization")
     online: bool | None = Field(None, description="Online (true) or in-person (false)")
@@ -16,10 +90,31 @@ class EventQuery(BaseModel):
         None, description="UF state code (e.g., SP, SC, RJ)"
     )
     address: str | None = Field(None, description="Filter by address")
+    near: str | None = Field(
+        None,
+        description="Latitude,longitude: in-person events around it, nearest first",
+    )
+    radius_km: float | None = Field(
+        None,
+        gt=0,
+        le=NEAR_MAX_RADIUS_KM,
+        description=f"Radius for `near` (default {NEAR_DEFAULT_RADIUS_KM} km)",
+    )
 
-    date_start_range: str | None = Field(None)
-    date_end_range: str | None = Field(None)
-    date_from: str | None = Field(None)
+    date_start_range: datetime | None = Field(
+        None, description="Start of the date range (YYYY-MM-DD or ISO datetime)"
+    )
+    date_end_range: datetime | None = Field(
+        None, description="End of the date range (YYYY-MM-DD or ISO datetime)"
+    )
+    date_range_mode: Optional[DateRangeMode] = Field(
+        None,
+        description="Match events entirely inside the range (default) or "
+        "events that overlap it",
+    )
+    date_from: datetime | None = Field(
+        None, description="Events starting at or after (YYYY-MM-DD or ISO datetime)"
+    )
 
     currency: Optional[Currency] = Field(
         None, description="Currency code (BRL, USD, EUR, etc)"
@@ -27,8 +122,46 @@ class EventQuery(BaseModel):
     is_free: Optional[bool] = Field(
         None, description="Filter for free (true) or paid (false) events"
     )
-    price_min: float | None = Field(None)
-    price_max: float | None = Field(None)
+    price_min: float | None = Field(
+        None, description="Minimum price, in BRL or in `currency` when given"
+    )
+    price_max: float | None = Field(
+        None, description="Maximum price, in BRL or in `currency` when given"
+    )
+
+    sort: Optional[EventSort] = Field(
+        None,
+        description="Order by start or by views and clicks (popular). "
+        "Without it, events with `near` come nearest first",
+    )
+
+    @field_validator("near")
+    @classmethod
+    def check_near(cls, near: str | None) -> str | None:
+        if near is not None:
+            try:
+                latitude, longitude = (float(v) for v in near.split(","))
+            except ValueError:
+                raise ValueError("Use near=<latitude>,<longitude>")
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                raise ValueError("Coordinates out of range")
+        return near
+
+    @field_validator("date_start_range", "date_end_range", "date_from")
+    @classmethod
+    def check_naive(cls, value: datetime | None) -> datetime | None:
+        # Event datetimes are stored as local wall-clock time, without a zone
+        if value is not None and value.tzinfo is not None:
+            raise ValueError("Datetimes must not include a timezone")
+        return value
+
+    @property
+    def parsed_near(self) -> tuple[float, float, float] | None:
+        """(latitude, longitude, radius in km) of ``near``."""
+        if self.near is None:
+            return None
+        latitude, longitude = (float(v) for v in self.near.split(","))
+        return latitude, longitude, self.radius_km or NEAR_DEFAULT_RADIUS_KM
 
     @property
     def parsed_tags(self) -> list[str] | None:
@@ -37,6 +170,99 @@ class EventQuery(BaseModel):
         return None
 
 
+def _check_batch_size(ids: list[int]) -> list[int]:
+    if not ids:
+        raise ValueError("At least one id is required")
+    if len(ids) > EVENTS_BATCH_MAX_IDS:
+        raise ValueError(f"At most {EVENTS_BATCH_MAX_IDS} ids per request")
+    return ids
+
+
+class EventBatchQuery(EventProjectionQuery):
+    ids: str = Field(..., description="Comma-separated list of event IDs")
+
+    @field_validator("ids")
+    @classmethod
+    def check_ids(cls, ids: str) -> str:
+        try:
+            _check_batch_size([int(i) for i in ids.split(",") if i.strip()])
+        except ValueError as e:
+            raise ValueError(f"Invalid ids: {e}")
+        return ids
+
+    @property
+    def parsed_ids(self) -> list[int]:
+        return [int(i) for i in self.ids.split(",") if i.strip()]
+
+
+class EventBatchBody(BaseModel):
+    ids: List[int] = Field(..., description="Event IDs, in the order to return them")
+
+    @field_validator("ids")
+    @classmethod
+    def check_ids(cls, ids: list[int]) -> list[int]:
+        return _check_batch_size(ids)
+
+
+class RelatedEventsQuery(EventProjectionQuery):
+    limit: int = Field(
+        RELATED_DEFAULT_LIMIT,
+        ge=1,
+        le=RELATED_MAX_LIMIT,
+        description="Maximum number of related events to return",
+    )
+
+
+class EventChangesQuery(EventProjectionQuery):
+    since: int = Field(
+        0, ge=0, description="Version returned by the previous call, 0 for everything"
+    )
+    limit: int = Field(
+        CHANGES_PAGE_SIZE,
+        ge=1,
+        le=CHANGES_MAX_PAGE_SIZE,
+        description="Maximum number of changes to return",
+    )
+
+
+class CalendarQuery(BaseModel):
+    date_from: date | None = Field(
+        None, alias="from", description="First day to include (YYYY-MM-DD)"
+    )
+    date_to: date | None = Field(
+        None, alias="to", description="Last day to include (YYYY-MM-DD)"
+    )
+    summary: bool = Field(
+        False,
+        description="Return per-day event counts by tag, state and online "
+        "instead of event IDs",
+    )
+
+
+class SuggestKind(enum.Enum):
+    tags = "tags"
+    organizations = "organizations"
+    events = "events"
+
+
+class SuggestQuery(BaseModel):
+    q: str = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="What was typed so far, matched against the start of each word",
+    )
+    kind: Optional[SuggestKind] = Field(
+        None, description="Suggest only tags, organizations or event names"
+    )
+    limit: int = Field(
+        SUGGEST_DEFAULT_LIMIT,
+        ge=1,
+        le=SUGGEST_MAX_LIMIT,
+        description="Maximum number of suggestions of each kind",
+    )
+
+
 class IntlData(BaseModel):
     event_edition: Optional[str] = None
     cost: Optional[float] = None
@@ -51,8 +277,11 @@ class Event(BaseModel):
     event_name: str
     start_datetime: datetime
     end_datetime: datetime
+    recurrence: Optional[str] = None
     address: Optional[str] = None
     maps_link: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     online: bool
     event_link: Optional[str] = None
     status: str
@@ -67,8 +296,19 @@ class EventIn(BaseModel):
     event_name: str
     start_datetime: datetime
     end_datetime: datetime
+    recurrence: Optional[str] = Field(
+        None,
+        description="RRULE repeating the event, e.g. FREQ=MONTHLY;BYDAY=2TU. "
+        "start_datetime and end_datetime are its first occurrence",
+    )
     address: Optional[str] = None
     maps_link: Optional[str] = None
+    latitude: Optional[float] = Field(
+        None, ge=-90, le=90, description="Taken from maps_link when omitted"
+    )
+    longitude: Optional[float] = Field(
+        None, ge=-180, le=180, description="Taken from maps_link when omitted"
+    )
     online: bool
     event_link: Optional[str] = None
     tags: List[str] = []
@@ -76,14 +316,28 @@ class EventIn(BaseModel):
     is_free: bool = True
     intl: Dict[str, IntlData] = {}
 
+    @field_validator("recurrence")
+    @classmethod
+    def check_recurrence(cls, recurrence: str | None) -> str | None:
+        return normalize_rule(recurrence) if recurrence else None
+
+    @model_validator(mode="after")
+    def check_series(self):
+        if self.recurrence and self.start_datetime and self.end_datetime:
+            last_end(self.recurrence, self.start_datetime, self.end_datetime)
+        return self
+
 
 class EventUpdate(BaseModel):
     organization_name: Optional[str] = None
     event_name: Optional[str] = None
     start_datetime: Optional[datetime] = None
     end_datetime: Optional[datetime] = None
+    recurrence: Optional[str] = None
     address: Optional[str] = None
     maps_link: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     online: Optional[bool] = None
     event_link: Optional[str] = None
     tags: Optional[List[str]] = None
@@ -92,6 +346,17 @@ class EventUpdate(BaseModel):
     state: Optional[States] = None
     is_free: Optional[bool] = None
 
+    @field_validator("recurrence")
+    @classmethod
+    def check_recurrence(cls, recurrence: str | None) -> str | None:
+        return normalize_rule(recurrence) if recurrence else None
+
+    @model_validator(mode="after")
+    def check_series(self):
+        if self.recurrence and self.start_datetime and self.end_datetime:
+            last_end(self.recurrence, self.start_datetime, self.end_datetime)
+        return self
+
 
 class SubmittedActions(enum.Enum):
     approved = "approved"
@@ -105,5 +370,39 @@ class ManageSubmittedEventBody(BaseModel):
     )
 
 
+class ReviewClaimBody(BaseModel):
+    moderator: str = Field(
+        ...,
+        min_length=1,
+        description="Name the moderator claims events under. Management tokens "
+        "are shared, so it is not checked against the token: leases only keep "
+        "moderators who send distinct names from reviewing the same events.",
+    )
+    limit: int = Field(
+        REVIEW_CLAIM_BATCH_SIZE,
+        ge=1,
+        le=REVIEW_CLAIM_MAX_BATCH_SIZE,
+        description="Maximum number of pending events to claim",
+    )
+    lease_seconds: int = Field(
+        REVIEW_LEASE_SECONDS,
+        ge=60,
+        le=24 * 60 * 60,
+        description="How long the claim is held before other moderators can take it",
+    )
+
+
+class ReviewReleaseBody(BaseModel):
+    moderator: str = Field(
+        ...,
+        min_length=1,
+        description="Name the event was claimed under (not checked against the token)",
+    )
+
+
+class SubmissionPath(BaseModel):
+    submission_id: str = Field(..., description="Tracking ID returned on submit")
+
+
 class EventPath(BaseModel):
     event_id: int = Field(..., description="Event ID")
@@ -0,0 +1,384 @@
+"""
+Response cache shared by every gunicorn worker on the host.
+
+Entries are JSON files in ``CACHE_DIR``. A cached value is fresh while it was
+computed at the current data generation and is younger than the TTL; writes
+bump the generation instead of deleting files, so old entries stay around to
+be served stale while one worker recomputes them. Recomputation is guarded by
+an ``flock`` so only one worker runs the query for a given key. Keys share a
+fixed set of lock files, picked by hash, which are never deleted: a lock file
+unlinked while held would let the next worker lock a fresh one.
+``purge`` deletes the entries that can no longer be served, and keeps the
+directory under ``CACHE_MAX_ENTRIES``.
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable
+
+from src.constants import (
+    CACHE_DIR,
+    CACHE_LOCK_STRIPES,
+    CACHE_LOCK_TIMEOUT_SECONDS,
+    CACHE_MAX_ENTRIES,
+    CACHE_TTL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+GENERATION_FILE = "generation"
+WRITE_LSN_FILE = "write_lsn"
+PURGE_LOCK = "purge"
+
+_stats = {
+    "hits": 0,
+    "stale": 0,
+    "misses": 0,
+    "waits": 0,
+    "errors": 0,
+    "shard_hits": 0,
+    "shard_misses": 0,
+}
+_stats_lock = threading.Lock()
+
+
+def _count(metric: str) -> None:
+    with _stats_lock:
+        _stats[metric] += 1
+
+
+def cache_stats() -> dict:
+    """Counters for this worker process since it started."""
+    with _stats_lock:
+        return {"pid": os.getpid(), **_stats}
+
+
+def cache_key(namespace: str, *parts: Any) -> str:
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return f"{namespace}-{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def _path(name: str) -> str:
+    return os.path.join(CACHE_DIR, name)
+
+
+def _read_json(name: str):
+    try:
+        with open(_path(name), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_json(name: str, data) -> None:
+    # Write then rename, readers never see a half written file.
+    tmp = _path(f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, _path(name))
+
+
+def _lock_path(name: str) -> str:
+    if name in (GENERATION_FILE, PURGE_LOCK):
+        return _path(f"{name}.lock")
+    stripe = int(hashlib.sha1(name.encode()).hexdigest(), 16) % CACHE_LOCK_STRIPES
+    return _path(f"stripe-{stripe}.lock")
+
+
+@contextmanager
+def _flock(name: str, blocking: bool):
+    with open(_lock_path(name), "a") as lock_file:
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(lock_file, flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _wait_for_lock(name: str) -> bool:
+    deadline = time.monotonic() + CACHE_LOCK_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        with _flock(name, blocking=False) as acquired:
+            if acquired:
+                return True
+        time.sleep(0.01)
+    return False
+
+
+def current_generation() -> int:
+    return _read_json(GENERATION_FILE) or 0
+
+
+def invalidate() -> None:
+    """Mark every cached value stale. Called after writes to public data."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with _flock(GENERATION_FILE, blocking=True):
+            _write_json(GENERATION_FILE, current_generation() + 1)
+    except OSError as e:
+        logger.error(f"Error invalidating cache: {e}")
+
+
+def record_write_lsn(lsn: str) -> None:
+    """
+    Store the primary WAL position of the latest write.
+
+    Replica reads wait for it, so an entry recomputed after ``invalidate`` is
+    never filled from a replica that has not replayed the write yet.
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _write_json(WRITE_LSN_FILE, lsn)
+    except OSError as e:
+        logger.error(f"Error recording write position: {e}")
+
+
+def last_write_lsn() -> str | None:
+    try:
+        return _read_json(WRITE_LSN_FILE)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _is_fresh(entry, generation: int) -> bool:
+    return (
+        entry is not None
+        and entry["generation"] == generation
+        and time.time() - entry["created_at"] < CACHE_TTL_SECONDS
+    )
+
+
+def _compute_and_store(key: str, generation: int, compute: Callable[[], Any]):
+    value = compute()
+    try:
+        _write_json(
+            key, {"generation": generation, "created_at": time.time(), "value": value}
+        )
+    except OSError as e:
+        _count("errors")
+        logger.error(f"Error writing cache entry {key}: {e}")
+    return value
+
+
+def cached(key: str, compute: Callable[[], Any]):
+    """
+    Return the cached value for ``key``, computing it with ``compute`` if needed.
+
+    Fresh entries are returned directly. When the entry is stale and another
+    worker is already recomputing it, the stale value is served. When there is
+    no entry at all, callers wait for the worker holding the lock and read its
+    result instead of issuing the same query.
+    """
+    # Only cache I/O is guarded: errors raised by ``compute`` propagate as is
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        generation = current_generation()
+        entry = _read_json(key)
+        fresh = _is_fresh(entry, generation)
+        lock_file = open(_lock_path(key), "a")
+    except (OSError, json.JSONDecodeError, KeyError) as e:
+        return _uncached(key, compute, e)
+    if fresh:
+        lock_file.close()
+        _count("hits")
+        return entry["value"]
+
+    with lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            acquired = True
+        except BlockingIOError:
+            acquired = False
+        if acquired:
+            _count("misses")
+            try:
+                return _compute_and_store(key, generation, compute)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    if entry is not None:
+        _count("stale")
+        return entry["value"]
+
+    _count("waits")
+    try:
+        if _wait_for_lock(key):
+            entry = _read_json(key)
+            if entry is not None and entry["generation"] >= generation:
+                return entry["value"]
+    except (OSError, json.JSONDecodeError, KeyError) as e:
+        return _uncached(key, compute, e)
+    return compute()
+
+
+def _uncached(key: str, compute: Callable[[], Any], error: Exception):
+    _count("errors")
+    logger.error(f"Cache unavailable for {key}: {error}")
+    return compute()
+
+
+def get_shards(keys: list[str]) -> dict:
+    """
+    Read independently invalidated entries, e.g. per-day slices of a listing.
+
+    Shards ignore the global generation: a write only evicts the shards it
+    touches. Missing, evicted and expired shards are left out of the result.
+    """
+    found = {}
+    for key in keys:
+        try:
+            entry = _read_json(key)
+        except (OSError, json.JSONDecodeError) as e:
+            _count("errors")
+            logger.error(f"Error reading cache shard {key}: {e}")
+            continue
+        if (
+            entry is not None
+            and not entry.get("evicted")
+            and time.time() - entry["created_at"] < CACHE_TTL_SECONDS
+        ):
+            found[key] = entry["value"]
+    with _stats_lock:
+        _stats["shard_hits"] += len(found)
+        _stats["shard_misses"] += len(keys) - len(found)
+    return found
+
+
+def put_shards(shards: dict, generation: int) -> None:
+    """
+    Store shards computed from data read at ``generation``.
+
+    A shard evicted after that generation is not overwritten, otherwise a read
+    racing with a write could put back the pre-write data.
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for key, value in shards.items():
+            with _flock(key, blocking=True):
+                existing = _read_json(key)
+                if existing is not None and existing["generation"] > generation:
+                    continue
+                _write_json(
+                    key,
+                    {
+                        "generation": generation,
+                        "created_at": time.time(),
+                        "shard": True,
+                        "value": value,
+                    },
+                )
+    except (OSError, json.JSONDecodeError) as e:
+        _count("errors")
+        logger.error(f"Error writing cache shards: {e}")
+
+
+def evict_shards(keys: list[str]) -> None:
+    """Evict shards after a write. Call after ``invalidate`` bumped the generation."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        generation = current_generation()
+        for key in keys:
+            with _flock(key, blocking=True):
+                _write_json(
+                    key, {"generation": generation, "shard": True, "evicted": True}
+                )
+    except (OSError, json.JSONDecodeError) as e:
+        _count("errors")
+        logger.error(f"Error evicting cache shards: {e}")
+
+
+def _remove_entry(name: str) -> bool:
+    """Delete an entry, unless a worker holds its lock."""
+    with _flock(name, blocking=False) as acquired:
+        if not acquired:
+            return False
+        try:
+            os.remove(_path(name))
+        except FileNotFoundError:
+            pass
+    return True
+
+
+def _is_purgeable(entry, generation: int, age: float) -> bool:
+    if entry.get("evicted"):
+        # Kept a while, so a read that started before the write cannot put
+        # back the data it evicted
+        return age > CACHE_TTL_SECONDS
+    if not entry.get("shard") and entry["generation"] < generation:
+        return True
+    return time.time() - entry["created_at"] > CACHE_TTL_SECONDS
+
+
+def purge() -> int:
+    """
+    Delete expired entries, entries of a past generation (shards excepted) and
+    orphaned temporary files, then the least recently written entries past
+    ``CACHE_MAX_ENTRIES``. Lock files are left alone. Returns the number of
+    entries deleted.
+
+    Every worker schedules it; the one holding the purge lock runs it.
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with _flock(PURGE_LOCK, blocking=False) as acquired:
+            if not acquired:
+                return 0
+            return _purge()
+    except OSError as e:
+        logger.error(f"Error purging cache: {e}")
+        return 0
+
+
+def _purge() -> int:
+    generation = current_generation()
+    now = time.time()
+    names = set(os.listdir(CACHE_DIR))
+    reserved = {GENERATION_FILE, WRITE_LSN_FILE, PURGE_LOCK}
+
+    deleted = 0
+    kept = []
+    for name in names:
+        if name.endswith(".tmp"):
+            # Left behind by a worker that died while writing
+            try:
+                if now - os.path.getmtime(_path(name)) > CACHE_TTL_SECONDS:
+                    os.remove(_path(name))
+            except FileNotFoundError:
+                pass
+            continue
+        if name.endswith(".lock") or name in reserved:
+            continue
+
+        try:
+            age = now - os.path.getmtime(_path(name))
+            entry = _read_json(name)
+        except (OSError, json.JSONDecodeError):
+            continue
+        if entry is None:
+            continue
+        try:
+            purgeable = _is_purgeable(entry, generation, age)
+        except (KeyError, TypeError):
+            purgeable = True
+        if purgeable:
+            if _remove_entry(name):
+                deleted += 1
+        else:
+            kept.append((age, name))
+
+    kept.sort(reverse=True)
+    for _, name in kept[: max(0, len(kept) - CACHE_MAX_ENTRIES)]:
+        if _remove_entry(name):
+            deleted += 1
+    return deleted
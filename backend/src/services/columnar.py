@@ -0,0 +1,72 @@
+"""
+Columnar encoding of event listings.
+
+The default ``/events`` response is a list of objects, so every key name and
+every repeated string (organization, state, tag) is sent once per event. The
+columnar form sends one array per field instead:
+
+    {
+        "count": 2,
+        "columns": {
+            "id": [12, 15],
+            "organization_name": [0, 0],
+            "start_datetime": [1745568000, 1745661600],
+            "tags": [[0, 1], [1]],
+            ...
+        },
+        "dictionaries": {
+            "organization_name": ["Python Brasil"],
+            "tags": ["python", "comunidade"],
+            ...
+        }
+    }
+
+Dictionary-encoded columns hold indexes into ``dictionaries``. Datetimes are
+integer seconds since the epoch of the event's wall-clock time (the stored
+datetimes are naive, so they are read as UTC and come back unchanged).
+"""
+
+from datetime import datetime, timezone
+
+import msgpack
+
+COLUMNAR_JSON_MIMETYPE = "application/vnd.calendario.columnar+json"
+MSGPACK_MIMETYPE = "application/msgpack"
+
+DICTIONARY_FIELDS = ("organization_name", "state", "status", "tags")
+DATETIME_FIELDS = ("start_datetime", "end_datetime")
+
+
+def _epoch(value: str) -> int:
+    return int(datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp())
+
+
+def to_columnar(events: list[dict]) -> dict:
+    """Turn serialized events into column arrays, keeping their key order."""
+    names = list(events[0]) if events else []
+    columns = {}
+    dictionaries = {}
+
+    for name in names:
+        values = [event[name] for event in events]
+        if name in DATETIME_FIELDS:
+            values = [_epoch(value) for value in values]
+        elif name == "tags":
+            codes = dictionaries[name] = {}
+            values = [
+                [codes.setdefault(tag, len(codes)) for tag in tags] for tags in values
+            ]
+        elif name in DICTIONARY_FIELDS:
+            codes = dictionaries[name] = {}
+            values = [codes.setdefault(value, len(codes)) for value in values]
+        columns[name] = values
+
+    return {
+        "count": len(events),
+        "columns": columns,
+        "dictionaries": {name: list(codes) for name, codes in dictionaries.items()},
+    }
+
+
+def pack_msgpack(payload) -> bytes:
+    return msgpack.packb(payload, use_bin_type=True)
@@ -0,0 +1,99 @@
+"""
+View and click counters of approved events.
+
+Counting a view with an ``UPDATE`` per request would turn every read of
+``/events/<id>`` into a write. Instead each worker adds views and clicks to an
+in-memory tally, and ``flush_counters`` (run every
+``COUNTERS_FLUSH_SECONDS`` and when the worker exits) adds the whole tally to
+``event_counters`` in one upsert. Counts for events that are not approved, or
+no longer exist, are dropped by the flush.
+"""
+
+import logging
+import threading
+from collections import Counter
+
+from sqlalchemy import text
+
+from src.models import db, EventCounter
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_views: Counter = Counter()
+_clicks: Counter = Counter()
+
+
+def record_view(event_id: int) -> None:
+    with _lock:
+        _views[event_id] += 1
+
+
+def record_click(event_id: int) -> None:
+    with _lock:
+        _clicks[event_id] += 1
+
+
+def _take() -> tuple[Counter, Counter]:
+    global _views, _clicks
+    with _lock:
+        views, clicks = _views, _clicks
+        _views, _clicks = Counter(), Counter()
+    return views, clicks
+
+
+def _restore(views: Counter, clicks: Counter) -> None:
+    with _lock:
+        _views.update(views)
+        _clicks.update(clicks)
+
+
+def flush_counters() -> int:
+    """Add the tally of this worker to ``event_counters``. Returns the events written."""
+    views, clicks = _take()
+    event_ids = sorted(views.keys() | clicks.keys())
+    if not event_ids:
+        return 0
+
+    try:
+        result = db.session.execute(
+            text(
+                """
+                INSERT INTO event_counters (event_id, views, clicks)
+                SELECT c.event_id, c.views, c.clicks
+                FROM unnest(
+                    CAST(:event_ids AS integer[]),
+                    CAST(:views AS bigint[]),
+                    CAST(:clicks AS bigint[])
+                ) AS c(event_id, views, clicks)
+                WHERE EXISTS (SELECT 1 FROM public_events p WHERE p.id = c.event_id)
+                ON CONFLICT (event_id) DO UPDATE SET
+                    views = event_counters.views + excluded.views,
+                    clicks = event_counters.clicks + excluded.clicks,
+                    updated_at = now()
+                """
+            ),
+            {
+                "event_ids": event_ids,
+                "views": [views[event_id] for event_id in event_ids],
+                "clicks": [clicks[event_id] for event_id in event_ids],
+            },
+        )
+        db.session.commit()
+    except Exception as e:
+        # Kept for the next flush rather than lost
+        logger.error(f"[counters] Error flushing counters: {e}")
+        db.session.rollback()
+        _restore(views, clicks)
+        return 0
+    return result.rowcount
+
+
+def get_scores(event_ids: list[int]) -> dict[int, int]:
+    """Popularity score of each of ``event_ids`` that has one."""
+    if not event_ids:
+        return {}
+    rows = db.session.query(EventCounter.event_id, EventCounter.score).filter(
+        EventCounter.event_id.in_(event_ids)
+    )
+    return dict(rows.all())
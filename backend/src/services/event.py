@@ -1,13 +1,99 @@
+import json
+import logging
+
+from src.constants import (
+    EVENT_INDEX_ENABLED,
+    EVENTS_NOTIFY_CHANNEL,
+    EVENTS_SHARD_MAX_DAYS,
+    REFERENCE_CURRENCY,
+    SNAPSHOT_DIR,
+    SUBMISSION_BATCH_SIZE,
+)
 from src.exceptions import DuplicateEventException, EventNotFoundException
-from src.models import db, Event, EventIntl, Tag as TagModel, EventStatus, Tag
+from src.models import (
+    EVENT_FIELDS,
+    Currency,
+    db,
+    Event,
+    EventIntl,
+    EventCounter,
+    EventDayRollup,
+    EventSubmission,
+    EventTombstone,
+    ExchangeRate,
+    PublicEvent,
+    SubmissionStatus,
+    Tag as TagModel,
+    EventStatus,
+    Tag,
+    events_version_seq,
+)
 from src.schemas import Event as EventDOT
-from sqlalchemy import func
-from sqlalchemy.orm import joinedload
-from src.schemas import EventIn, EventUpdate, EventQuery
-from datetime import datetime
+from src.services.counters import get_scores
+from src.services.cache import (
+    cache_key,
+    cached,
+    current_generation,
+    evict_shards,
+    get_shards,
+    invalidate,
+    put_shards,
+)
+from src.services.event_index import event_index
+from src.services.geo import (
+    cell_ranges,
+    coordinates_from_maps_link,
+    covering_cells,
+    distance_km,
+    distance_km_sql,
+    encode_geohash,
+)
+from src.services.recurrence import horizon, last_end, occurrences
+from src.services.replica import note_write, replica_reads
+from src.services.snapshot import publish_changes, rebuild_snapshot
+from sqlalchemy import (
+    and_,
+    case,
+    cast,
+    distinct,
+    exists,
+    func,
+    null,
+    or_,
+    select,
+    text,
+    true,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from src.schemas import (
+    DateRangeMode,
+    EventIn,
+    EventProjectionQuery,
+    EventQuery,
+    EventSort,
+    EventUpdate,
+    TagsMode,
+)
+from datetime import date, datetime, time, timedelta
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
 
 
 def submit_event(data: EventIn) -> Event:
+    _add_event(data)
+    db.session.commit()
+
+    return Event.query.filter_by(
+        organization_name=data.organization_name,
+        event_name=data.event_name,
+        start_datetime=data.start_datetime,
+    ).first()
+
+
+def _add_event(data: EventIn) -> Event:
     existing_event = Event.query.filter_by(
         organization_name=data.organization_name,
         event_name=data.event_name,
@@ -29,9 +115,11 @@ def submit_event(data: EventIn) -> Event:
         online=data.online,
         event_link=data.event_link,
         state=data.state,
-        is_free=data.is_free
+        is_free=data.is_free,
     )
 
+    _set_recurrence(event, data.recurrence)
+    _set_location(event, data.latitude, data.longitude)
     db.session.add(event)
 
     for tag_name in data.tags:
@@ -46,36 +134,105 @@ def submit_event(data: EventIn) -> Event:
             lang=lang,
             event_edition=intl.event_edition,
             cost=intl.cost,
+            currency=intl.currency or Currency.BRL,
             banner_link=intl.banner_link,
             short_description=intl.short_description,
         )
         event.intl.append(intl_obj)
 
+    return event
+
+
+def _set_location(event: Event, latitude: float | None, longitude: float | None):
+    """Use the given coordinates, else the ones written in ``maps_link``."""
+    if latitude is None or longitude is None:
+        coordinates = coordinates_from_maps_link(event.maps_link)
+        latitude, longitude = coordinates if coordinates else (None, None)
+    event.latitude = latitude
+    event.longitude = longitude
+    event.geohash = None if latitude is None else encode_geohash(latitude, longitude)
+
+
+def _set_recurrence(event: Event, recurrence: str | None):
+    event.recurrence = recurrence
+    event.recurrence_until = (
+        last_end(recurrence, event.start_datetime, event.end_datetime)
+        if recurrence
+        else None
+    )
+
+
+def enqueue_submission(data: EventIn) -> EventSubmission:
+    submission = EventSubmission(payload=data.model_dump(mode="json"))
+    db.session.add(submission)
     db.session.commit()
+    return submission
 
-    return Event.query.filter_by(
-        organization_name=data.organization_name,
-        event_name=data.event_name,
-        start_datetime=data.start_datetime,
-    ).first()
+
+def get_submission(submission_id: str) -> EventSubmission:
+    submission = db.session.get(EventSubmission, submission_id)
+    if not submission:
+        raise EventNotFoundException(f"Submission {submission_id} not found.")
+    return submission
+
+
+def process_submission_queue(batch_size: int = SUBMISSION_BATCH_SIZE) -> int:
+    """
+    Drain one batch of queued submissions into events.
+
+    Rows are locked with SKIP LOCKED so every worker can run the drainer without
+    double-processing. Each submission is written inside its own savepoint and
+    the whole batch is committed once.
+    """
+    submissions = (
+        EventSubmission.query.filter_by(status=SubmissionStatus.queued)
+        .order_by(EventSubmission.created_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    for submission in submissions:
+        try:
+            with db.session.begin_nested():
+                event = _add_event(EventIn.model_validate(submission.payload))
+                db.session.flush()
+            submission.status = SubmissionStatus.accepted
+            submission.event_id = event.id
+        except DuplicateEventException as e:
+            submission.status = SubmissionStatus.rejected
+            submission.error = str(e)
+        except Exception as e:
+            logger.error(f"Error processing submission {submission.id}: {e}")
+            submission.status = SubmissionStatus.failed
+            submission.error = "Internal error while processing submission."
+        submission.processed_at = func.now()
+
+    db.session.commit()
+    return len(submissions)
 
 
 def update_event(event_id: int, event_data: EventUpdate) -> Event:
     event = Event.query.filter_by(id=event_id).first()
     if not event:
         raise EventNotFoundException(f"Event with ID {event_id} not found.")
+    previous_start = event.start_datetime
+    previous_status = event.status
 
     event.organization_name = event_data.organization_name
     event.event_name = event_data.event_name
     event.start_datetime = event_data.start_datetime
     event.end_datetime = event_data.end_datetime
+    _set_recurrence(event, event_data.recurrence)
     event.address = event_data.address
     event.maps_link = event_data.maps_link
+    _set_location(event, event_data.latitude, event_data.longitude)
     event.online = event_data.online
     event.event_link = event_data.event_link
     event.status = event_data.status
     event.state = event_data.state
     event.is_free = event_data.is_free
+    event.version = events_version_seq.next_value()
 
     event.tags.clear()
     for tag_name in event_data.tags:
@@ -93,74 +250,658 @@ def update_event(event_id: int, event_data: EventUpdate) -> Event:
             lang=lang,
             event_edition=intl.event_edition,
             cost=intl.cost,
+            currency=intl.currency or Currency.BRL,
             banner_link=intl.banner_link,
             short_description=intl.short_description,
         )
         intl_obj.event = event
         event.intl.append(intl_obj)
 
+    _refresh_public_event(event.id)
+    _notify_change(event.id, previous_status, event.status)
     db.session.commit()
+    _invalidate_public(event.id, previous_start, event.start_datetime)
     return event
 
 
 def get_events(filters: EventQuery = None, status: EventStatus = None) -> list[dict]:
-    query = Event.query.options(joinedload(Event.intl), joinedload(Event.tags))
+    if status and status != EventStatus.approved:
+        return _query_events(filters, status)
+    return _get_public_events(filters)
+
 
-    if status:
-        query = query.filter(Event.status == status)
+@replica_reads
+def _get_public_events(filters: EventQuery | None) -> list[dict]:
+    """
+    One-off events from the index, the day shards or the cached query, plus
+    the occurrences of recurring series, which none of those hold.
+    """
+    window = _date_only_window(filters)
+    if EVENT_INDEX_ENABLED:
+        events = _project(_sort_events(event_index.search(filters), filters), filters)
+    elif window:
+        events = _project(_get_events_in_window(*window), filters)
     else:
-        query = query.filter(Event.status == EventStatus.approved)
+        key = cache_key("events", filters.model_dump(mode="json") if filters else None)
+        events = cached(key, lambda: _query_public_events(filters))
+    return _add_occurrences(events, filters)
 
-    if filters:
-        if filters.parsed_tags:
-            query = query.join(Event.tags).filter(Tag.name.in_(filters.parsed_tags))
 
-        if filters.name:
-            query = query.filter(Event.event_name.ilike(f"%{filters.name}%"))
+def _add_occurrences(events: list[dict], filters: EventQuery | None) -> list[dict]:
+    """``events`` with the matching occurrences added, in listing order."""
+    found = _matching_occurrences(filters)
+    if not found:
+        return events
+    return _sort_events(events + _project(found, filters), filters)
+
+
+def _sort_events(events: list[dict], filters: EventQuery | None) -> list[dict]:
+    """
+    Sort serialized events the way ``_order`` sorts a query, when the
+    projection kept the fields to sort on.
+    """
+    sort = filters.sort if filters else None
+    if sort == EventSort.popular:
+        required = {"id", "start_datetime"}
+        scores = {}
+        if events and required <= events[0].keys():
+            scores = get_scores([event["id"] for event in events])
+
+        def key(event):
+            return -scores.get(event["id"], 0), event["start_datetime"], event["id"]
+
+    elif filters and filters.near and sort != EventSort.start:
+        required = {"latitude", "longitude", "id"}
+        latitude, longitude, _ = filters.parsed_near
+
+        def key(event):
+            return (
+                distance_km(latitude, longitude, event["latitude"], event["longitude"]),
+                event["id"],
+            )
+
+    else:
+        required = {"start_datetime", "id"}
+
+        def key(event):
+            return event["start_datetime"], event["id"]
 
-        if filters.org:
-            query = query.filter(Event.organization_name.ilike(f"%{filters.org}%"))
+    if events and required <= events[0].keys():
+        events.sort(key=key)
+    return events
 
-        if filters.online is not None:
-            query = query.filter(Event.online == filters.online)
 
-        if filters.state:
-            query = query.filter(Event.state == filters.state)
+def _matching_occurrences(filters: EventQuery | None) -> list[dict]:
+    """Serialized occurrences of the approved series matching ``filters``."""
+    after, before = _expansion_window(filters)
+    key = cache_key("series", filters.model_dump(mode="json") if filters else None)
 
-        if filters.address:
-            query = query.filter(Event.address.ilike(f"%{filters.address}%"))
+    found = []
+    for series in cached(key, lambda: _query_series(filters)):
+        for start, end in _series_occurrences(series, after, before):
+            if _occurrence_matches(start, end, filters):
+                found.append(
+                    {
+                        **series,
+                        "start_datetime": start.isoformat(),
+                        "end_datetime": end.isoformat(),
+                    }
+                )
+    return found
 
-        if filters.date_from:
-            query = query.filter(Event.start_datetime >= filters.date_from)
 
+def _expansion_window(filters: EventQuery | None) -> tuple[datetime | None, datetime]:
+    """
+    Occurrences matching the date filters end at or after the first bound and
+    start at or before the second. Without an end, ``horizon`` is used.
+    """
+    after = before = None
+    if filters:
+        bounds = [filters.date_from]
         if filters.date_start_range and filters.date_end_range:
-            query = query.filter(
-                Event.start_datetime >= filters.date_start_range,
-                Event.end_datetime <= filters.date_end_range,
+            bounds.append(filters.date_start_range)
+            before = filters.date_end_range
+        after = max((bound for bound in bounds if bound), default=None)
+    return after, before or horizon(after)
+
+
+def _query_series(filters: EventQuery | None) -> list[dict]:
+    """
+    Approved series matching every filter but the dates, and that can have
+    occurrences inside the expansion window.
+    """
+    after, before = _expansion_window(filters)
+    query = PublicEvent.query.filter(
+        PublicEvent.recurrence.isnot(None), PublicEvent.start_datetime <= before
+    )
+    if after:
+        query = query.filter(
+            or_(
+                PublicEvent.recurrence_until.is_(None),
+                PublicEvent.recurrence_until >= after,
+            )
+        )
+    if filters:
+        undated = filters.model_copy(
+            update={"date_from": None, "date_start_range": None, "date_end_range": None}
+        )
+        query = _filter_public(query, undated)
+    return [event.serialized for event in query.order_by(PublicEvent.id)]
+
+
+def _series_occurrences(
+    series: dict, after: datetime | None, before: datetime
+) -> list[tuple[datetime, datetime]]:
+    """``occurrences`` of a serialized series, cached per series and window."""
+    key = cache_key("occurrences", series["id"], after, before)
+    expanded = cached(
+        key,
+        lambda: [
+            [start.isoformat(), end.isoformat()]
+            for start, end in occurrences(
+                series["recurrence"],
+                datetime.fromisoformat(series["start_datetime"]),
+                datetime.fromisoformat(series["end_datetime"]),
+                after,
+                before,
+            )
+        ],
+    )
+    return [
+        (datetime.fromisoformat(start), datetime.fromisoformat(end))
+        for start, end in expanded
+    ]
+
+
+def _occurrence_matches(
+    start: datetime, end: datetime, filters: EventQuery | None
+) -> bool:
+    """The date filters of ``_filter_columns``, on one occurrence."""
+    if not filters:
+        return True
+    if filters.date_from and start < filters.date_from:
+        return False
+    if filters.date_start_range and filters.date_end_range:
+        range_start, range_end = filters.date_start_range, filters.date_end_range
+        if filters.date_range_mode == DateRangeMode.overlaps:
+            return start <= range_end and max(start, end) >= range_start
+        return start >= range_start and end <= range_end
+    return True
+
+
+def _date_only_window(filters: EventQuery | None) -> tuple[datetime, datetime] | None:
+    """The (start, end) window when the query filters on nothing but a date range."""
+    if not filters or not filters.date_start_range or not filters.date_end_range:
+        return None
+    # Shards are keyed on the start day, overlapping events can start earlier
+    if filters.date_range_mode == DateRangeMode.overlaps:
+        return None
+    if filters.model_dump(exclude_none=True).keys() - {
+        "date_start_range",
+        "date_end_range",
+        "date_range_mode",
+        "fields",
+        "lang",
+    }:
+        return None
+    start, end = filters.date_start_range, filters.date_end_range
+    if (end.date() - start.date()).days > EVENTS_SHARD_MAX_DAYS:
+        return None
+    return start, end
+
+
+def _project(events: list[dict], projection: EventProjectionQuery | None) -> list[dict]:
+    """Apply ``fields`` and ``lang`` to already serialized events."""
+    fields = projection.parsed_fields if projection else None
+    chain = projection.language_chain if projection else None
+    if not fields and not chain:
+        return events
+
+    projected = []
+    for event in events:
+        event = {name: event[name] for name in fields} if fields else dict(event)
+        if chain and "intl" in event:
+            event["intl"] = _select_language(event["intl"], chain)
+        projected.append(event)
+    return projected
+
+
+def _select_language(intl: dict, chain: tuple[str, ...]) -> dict:
+    for lang in chain:
+        if lang in intl:
+            return {lang: intl[lang]}
+    return intl
+
+
+def _public_intl_in_language(chain: tuple[str, ...]):
+    """
+    SQL for ``PublicEvent.intl`` reduced to the first language of ``chain``
+    the event has. Events with none of them keep their full intl.
+    """
+    return case(
+        *[
+            (
+                PublicEvent.intl.has_key(lang),
+                func.jsonb_build_object(lang, PublicEvent.intl[lang]),
             )
+            for lang in chain
+        ],
+        else_=PublicEvent.intl,
+    ).label("projected_intl")
 
-        if filters.is_free is not None:
-            query = query.filter(Event.is_free == filters.is_free)
+
+def _public_query(projection: EventProjectionQuery | None):
+    """
+    Query on ``PublicEvent`` with the projection applied at the SQL level.
+
+    Rows are ``(event, intl)``: ``intl`` is ``None`` when no language was
+    requested, in which case the event's own column is used.
+    """
+    fields = projection.parsed_fields if projection else None
+    chain = projection.language_chain if projection else None
+    if not chain or (fields and "intl" not in fields):
+        return PublicEvent.query.options(
+            *_load_options(PublicEvent, fields)
+        ).add_columns(null().label("projected_intl"))
+
+    columns = tuple(f for f in fields or EVENT_FIELDS if f != "intl")
+    return PublicEvent.query.options(*_load_options(PublicEvent, columns)).add_columns(
+        _public_intl_in_language(chain)
+    )
+
+
+def _serialize_public_row(
+    event: PublicEvent, intl, projection: EventProjectionQuery | None
+) -> dict:
+    fields = projection.parsed_fields if projection else None
+    if intl is None:
+        return event.serialize(fields)
+    data = event.serialize(tuple(f for f in fields or EVENT_FIELDS if f != "intl"))
+    data["intl"] = intl
+    return data
+
+
+def _load_options(model, fields: tuple[str, ...] | None) -> list:
+    """
+    Loader options fetching only ``fields``.
+
+    ``Event`` keeps tags and intl in other tables: they are joined only when
+    requested. ``PublicEvent`` stores them as columns, so a plain column
+    projection is enough.
+    """
+    if model is PublicEvent:
+        if not fields:
+            return []
+        return [load_only(*[getattr(PublicEvent, name) for name in fields])]
+
+    options = [joinedload(Event.intl), joinedload(Event.tags)]
+    if fields:
+        columns = [
+            getattr(Event, name) for name in fields if name not in ("tags", "intl")
+        ]
+        options = [load_only(*columns)]
+        if "intl" in fields:
+            options.append(joinedload(Event.intl))
+        if "tags" in fields:
+            options.append(joinedload(Event.tags))
+    return options
+
+
+def _day_shard_key(day: date) -> str:
+    return f"events-day-{day.isoformat()}"
+
+
+def _get_events_in_window(start: datetime, end: datetime) -> list[dict]:
+    """
+    Approved events with ``start <= start_datetime`` and ``end_datetime <= end``.
+
+    Assembled from per-day shards keyed on the start date, so overlapping
+    windows share cache entries. Only the days missing from the cache are
+    read from Postgres, in a single query.
+    """
+    days = [
+        start.date() + timedelta(days=i)
+        for i in range((end.date() - start.date()).days + 1)
+    ]
+    keys = [_day_shard_key(day) for day in days]
+    shards = get_shards(keys)
+
+    missing = [day for day, key in zip(days, keys) if key not in shards]
+    if missing:
+        generation = current_generation()
+        fetched = {_day_shard_key(day): [] for day in missing}
+        rows = (
+            PublicEvent.query.filter(
+                PublicEvent.start_datetime >= missing[0],
+                PublicEvent.start_datetime < missing[-1] + timedelta(days=1),
+                PublicEvent.recurrence.is_(None),
+            )
+            .order_by(PublicEvent.start_datetime, PublicEvent.id)
+            .all()
+        )
+        for event in rows:
+            key = _day_shard_key(event.start_datetime.date())
+            if key in fetched:
+                fetched[key].append(event.serialized)
+        put_shards(fetched, generation)
+        shards.update(fetched)
+
+    return [
+        event
+        for key in keys
+        for event in shards[key]
+        if datetime.fromisoformat(event["start_datetime"]) >= start
+        and datetime.fromisoformat(event["end_datetime"]) <= end
+    ]
+
+
+def _query_events(filters: EventQuery = None, status: EventStatus = None) -> list[dict]:
+    if not status or status == EventStatus.approved:
+        return _query_public_events(filters)
+
+    fields = filters.parsed_fields if filters else None
+    query = Event.query.options(*_load_options(Event, fields))
+    query = query.filter(Event.status == status)
+
+    if filters:
+        if filters.parsed_tags and filters.tags_mode == TagsMode.all:
+            for tag_name in filters.parsed_tags:
+                query = query.filter(Event.tags.any(Tag.name == tag_name))
+        elif filters.parsed_tags:
+            query = query.join(Event.tags).filter(Tag.name.in_(filters.parsed_tags))
+
+        query = _filter_columns(query, Event, filters)
 
         if (
             filters.currency
             or filters.price_min is not None
             or filters.price_max is not None
         ):
-            query = query.join(EventIntl)
-            if filters.currency:
-                query = query.filter(EventIntl.currency == filters.currency)
-            if filters.price_min is not None:
-                query = query.filter(EventIntl.cost >= filters.price_min)
-            if filters.price_max is not None:
-                query = query.filter(EventIntl.cost <= filters.price_max)
+            query = query.join(EventIntl).filter(*_intl_conditions(filters))
+
+    query = _order(query, Event, filters)
+    return _project([e.serialize(fields) for e in query.all()], filters)
+
+
+def _query_public_events(filters: EventQuery = None) -> list[dict]:
+    """Approved one-off events matching ``filters``."""
+    query = _public_query(filters).filter(PublicEvent.recurrence.is_(None))
+    query = _filter_public(query, filters)
+    query = _order(query, PublicEvent, filters)
+    return [_serialize_public_row(e, intl, filters) for e, intl in query.all()]
+
+
+def _filter_public(query, filters: EventQuery | None):
+    """Apply ``filters`` to a query or select over ``PublicEvent``."""
+    if filters:
+        if filters.parsed_tags:
+            tags = cast(filters.parsed_tags, ARRAY(db.String))
+            if filters.tags_mode == TagsMode.all:
+                query = query.filter(PublicEvent.tags.contains(tags))
+            else:
+                query = query.filter(PublicEvent.tags.overlap(tags))
+
+        query = _filter_columns(query, PublicEvent, filters)
+
+        if filters.currency:
+            query = query.filter(
+                exists().where(
+                    EventIntl.event_id == PublicEvent.id,
+                    EventIntl.currency == filters.currency,
+                )
+            )
+        prices = _price_conditions(PublicEvent.reference_price, filters)
+        if prices:
+            query = query.filter(*prices)
+    return query
+
+
+@replica_reads
+def get_facets(filters: EventQuery | None = None) -> dict:
+    """
+    Number of approved events matching ``filters`` per tag, state, online and
+    is_free, plus the total.
+    """
+    if EVENT_INDEX_ENABLED:
+        facets = event_index.facets(filters)
+    else:
+        key = cache_key("facets", filters.model_dump(mode="json") if filters else None)
+        facets = cached(key, lambda: _query_facets(filters))
+    return _add_series_facets(facets, filters)
+
+
+def _add_series_facets(facets: dict, filters: EventQuery | None) -> dict:
+    """Count each series with a matching occurrence once, like a one-off event."""
+    counted = set()
+    for event in _matching_occurrences(filters):
+        if event["id"] in counted:
+            continue
+        counted.add(event["id"])
+        facets["total"] += 1
+        values = [("tags", tag) for tag in event["tags"]]
+        values += [("state", event["state"]), ("is_free", event["is_free"])]
+        if event["online"] is not None:
+            values.append(("online", event["online"]))
+        for kind, value in values:
+            if isinstance(value, bool):
+                value = "true" if value else "false"
+            facets[kind][value] = facets[kind].get(value, 0) + 1
+    return facets
+
+
+def _query_facets(filters: EventQuery | None) -> dict:
+    """All facets of the one-off events from a single ``GROUPING SETS`` query."""
+    tags = (
+        func.unnest(PublicEvent.tags)
+        .table_valued("tag")
+        .render_derived(name="facet_tags")
+        .lateral()
+    )
+    columns = (tags.c.tag, PublicEvent.state, PublicEvent.online, PublicEvent.is_free)
+    query = (
+        select(
+            func.grouping(*columns).label("grouping_bits"),
+            *columns,
+            func.count(distinct(PublicEvent.id)).label("events"),
+        )
+        .select_from(PublicEvent)
+        .outerjoin(tags, true())
+        .where(PublicEvent.recurrence.is_(None))
+    )
+    query = _filter_public(query, filters).group_by(
+        func.grouping_sets(*columns, tuple_())
+    )
+
+    facets = {"total": 0, "tags": {}, "state": {}, "online": {}, "is_free": {}}
+    for row in db.session.execute(query):
+        # grouping() sets one bit per column left out of the set, first column highest
+        if row.grouping_bits == 0b1111:
+            facets["total"] = row.events
+        elif row.grouping_bits == 0b0111 and row.tag is not None:
+            facets["tags"][row.tag] = row.events
+        elif row.grouping_bits == 0b1011:
+            facets["state"][row.state.value] = row.events
+        elif row.grouping_bits == 0b1101 and row.online is not None:
+            facets["online"]["true" if row.online else "false"] = row.events
+        elif row.grouping_bits == 0b1110:
+            facets["is_free"]["true" if row.is_free else "false"] = row.events
+    return facets
+
+
+def _filter_columns(query, model, filters: EventQuery):
+    """Filters on columns shared by ``Event`` and ``PublicEvent``."""
+    if filters.name:
+        query = query.filter(model.event_name.ilike(f"%{filters.name}%"))
+
+    if filters.org:
+        query = query.filter(model.organization_name.ilike(f"%{filters.org}%"))
+
+    if filters.online is not None:
+        query = query.filter(model.online == filters.online)
+
+    if filters.state:
+        query = query.filter(model.state == filters.state)
+
+    if filters.address:
+        query = query.filter(model.address.ilike(f"%{filters.address}%"))
+
+    if filters.near:
+        query = query.filter(*_near_conditions(model, filters))
+
+    if filters.date_from:
+        query = query.filter(model.start_datetime >= filters.date_from)
+
+    if filters.date_start_range and filters.date_end_range:
+        query = query.filter(*_date_range_conditions(model, filters))
+
+    if filters.is_free is not None:
+        query = query.filter(model.is_free == filters.is_free)
+
+    return query
+
+
+def _near_conditions(model, filters: EventQuery) -> list:
+    latitude, longitude, radius_km = filters.parsed_near
+    cells = covering_cells(latitude, longitude, radius_km)
+    in_cells = (
+        or_(
+            *[
+                and_(model.geohash >= low, model.geohash < high)
+                for low, high in cell_ranges(cells)
+            ]
+        )
+        if cells
+        else model.geohash.isnot(None)
+    )
+    distance = distance_km_sql(model.latitude, model.longitude, latitude, longitude)
+    return [in_cells, distance <= radius_km]
+
+
+def _order(query, model, filters: EventQuery | None):
+    """``sort``, or nearest first with ``near``; unordered otherwise."""
+    sort = filters.sort if filters else None
+    if sort == EventSort.popular:
+        return query.outerjoin(
+            EventCounter, EventCounter.event_id == model.id
+        ).order_by(
+            func.coalesce(EventCounter.score, 0).desc(), model.start_datetime, model.id
+        )
+    if sort == EventSort.start:
+        return query.order_by(model.start_datetime, model.id)
+    if not filters or not filters.near:
+        return query
+    latitude, longitude, _ = filters.parsed_near
+    distance = distance_km_sql(model.latitude, model.longitude, latitude, longitude)
+    return query.order_by(distance, model.id)
+
+
+def _date_range_conditions(model, filters: EventQuery) -> list:
+    start, end = filters.date_start_range, filters.date_end_range
+    if filters.date_range_mode != DateRangeMode.overlaps:
+        return [model.start_datetime >= start, model.end_datetime <= end]
+    if model is PublicEvent:
+        # The start bound is implied by the overlap, but it lets Postgres
+        # skip the partitions of later years
+        return [
+            PublicEvent.period.overlaps(func.tsrange(start, end, "[]")),
+            PublicEvent.start_datetime <= end,
+        ]
+    return [model.start_datetime <= end, model.end_datetime >= start]
+
+
+def _rate(currency):
+    """
+    Exchange rate of ``currency`` (a value or a column), NULL when unknown, so
+    amounts in a currency without a rate match no price filter.
+    """
+    return (
+        select(ExchangeRate.rate)
+        .where(ExchangeRate.currency == currency)
+        .scalar_subquery()
+    )
 
-    return [e.serialized for e in query.all()]
 
+def _price_conditions(price, filters: EventQuery) -> list:
+    """
+    ``price_min``/``price_max`` against ``price``, an amount in
+    ``REFERENCE_CURRENCY``. The bounds are in ``currency`` when it is given.
+    """
+    currency = filters.currency or Currency(REFERENCE_CURRENCY)
+    conditions = []
+    if filters.price_min is not None:
+        conditions.append(price >= filters.price_min * _rate(currency))
+    if filters.price_max is not None:
+        conditions.append(price <= filters.price_max * _rate(currency))
+    return conditions
 
-def get_event(event_id: int) -> EventDOT:
+
+def _intl_conditions(filters: EventQuery) -> list:
+    conditions = []
+    if filters.currency:
+        conditions.append(EventIntl.currency == filters.currency)
+    price = EventIntl.cost * _rate(
+        func.coalesce(EventIntl.currency, Currency(REFERENCE_CURRENCY))
+    )
+    conditions += _price_conditions(price, filters)
+    return conditions
+
+
+def _refresh_public_event(event_id: int) -> None:
+    db.session.flush()
+    db.session.execute(select(func.refresh_public_event(event_id)))
+
+
+def _notify_change(event_id: int, previous_status, status) -> None:
+    """
+    Announce a change to the public listing on ``EVENTS_NOTIFY_CHANNEL``.
+
+    Sent inside the write transaction: Postgres delivers it only on commit.
+    Changes to events that were and stay non-public are not announced.
+    """
+    was_public = (
+        previous_status and EventStatus(previous_status) == EventStatus.approved
+    )
+    is_public = status and EventStatus(status) == EventStatus.approved
+    if is_public:
+        change = "updated" if was_public else "approved"
+    elif was_public:
+        change = "removed"
+    else:
+        return
+
+    payload = json.dumps({"id": event_id, "change": change})
+    db.session.execute(select(func.pg_notify(EVENTS_NOTIFY_CHANNEL, payload)))
+
+
+def _invalidate_public(event_id: int, *start_datetimes: datetime) -> None:
+    """Drop cached copies of the public data touched by a write to ``event_id``."""
+    days = {d.date() for d in start_datetimes if d is not None}
+    note_write()
+    invalidate()
+    evict_shards([_event_shard_key(event_id)] + [_day_shard_key(day) for day in days])
+
+    if SNAPSHOT_DIR:
+        try:
+            publish_changes({event_id}, {day.replace(day=1) for day in days})
+        except Exception as e:
+            logger.error(f"[snapshot] Error publishing event {event_id}: {e}")
+
+
+def _invalidate_public_many(event_ids: list[int], days: set[date]) -> None:
+    """``_invalidate_public`` for bulk changes, rebuilding the snapshot once."""
+    note_write()
+    invalidate()
+    evict_shards(
+        [_event_shard_key(event_id) for event_id in event_ids]
+        + [_day_shard_key(day) for day in days]
+    )
+    if SNAPSHOT_DIR:
+        rebuild_snapshot()
+
+
+def get_event(event_id: int, fields: tuple[str, ...] | None = None) -> EventDOT:
     event = (
-        Event.query.options(joinedload(Event.intl), joinedload(Event.tags))
+        Event.query.options(*_load_options(Event, fields))
         .filter_by(id=event_id)
         .first()
     )
@@ -170,13 +911,140 @@ def get_event(event_id: int) -> EventDOT:
     return event
 
 
+@replica_reads
+def get_public_event(
+    event_id: int, projection: EventProjectionQuery | None = None
+) -> dict:
+    """Serialized event, from ``public_events`` when the event is approved."""
+    row = _public_query(projection).filter(PublicEvent.id == event_id).first()
+    if row:
+        return _serialize_public_row(*row, projection)
+
+    fields = projection.parsed_fields if projection else None
+    return _project([get_event(event_id, fields).serialize(fields)], projection)[0]
+
+
+@replica_reads
+def get_event_link(event_id: int) -> str | None:
+    """
+    ``event_link`` of an approved event, ``None`` when it has none or it is
+    not an http(s) URL. Only ``public_events`` is read: a link is never
+    served before moderation.
+    """
+    row = (
+        db.session.query(PublicEvent.event_link)
+        .filter(PublicEvent.id == event_id)
+        .first()
+    )
+    if row is None:
+        raise EventNotFoundException(f"Event with ID {event_id} not found.")
+    event_link = row.event_link
+    if not event_link or urlsplit(event_link).scheme.lower() not in ("http", "https"):
+        return None
+    return event_link
+
+
+def _event_shard_key(event_id: int) -> str:
+    return f"event-{event_id}"
+
+
+@replica_reads
+def get_events_by_ids(
+    event_ids: list[int], projection: EventProjectionQuery | None = None
+) -> tuple[list[dict], list[int]]:
+    """
+    Serialized events in the order of ``event_ids``, and the ids not found.
+
+    Each event is cached as its own shard, so overlapping id lists share
+    entries. Cache misses are read in one query on ``public_events``. Ids
+    missing from it fall back to one query on ``events``, with tags and intl
+    selectin-loaded, for approved events in archived partitions only: pending
+    and declined submissions are reported as not found.
+    """
+    event_ids = list(dict.fromkeys(event_ids))
+    keys = {event_id: _event_shard_key(event_id) for event_id in event_ids}
+    shards = get_shards(list(keys.values()))
+    found = {event_id: shards[key] for event_id, key in keys.items() if key in shards}
+
+    missing = [event_id for event_id in event_ids if event_id not in found]
+    if missing:
+        generation = current_generation()
+        public = {
+            event.id: event.serialized
+            for event in PublicEvent.query.filter(PublicEvent.id.in_(missing))
+        }
+        put_shards(
+            {_event_shard_key(event_id): event for event_id, event in public.items()},
+            generation,
+        )
+        found.update(public)
+
+        others = [event_id for event_id in missing if event_id not in public]
+        if others:
+            events = Event.query.options(
+                selectinload(Event.intl), selectinload(Event.tags)
+            ).filter(Event.id.in_(others), Event.status == EventStatus.approved)
+            found.update({event.id: event.serialized for event in events})
+
+    events = [found[event_id] for event_id in event_ids if event_id in found]
+    not_found = [event_id for event_id in event_ids if event_id not in found]
+    return _project(events, projection), not_found
+
+
+@replica_reads
+def get_changes(
+    since: int, limit: int, projection: EventProjectionQuery | None = None
+) -> dict:
+    """
+    Public events created, updated or removed after version ``since``.
+
+    Changes come in version order. ``version`` is the cursor for the next call
+    and ``has_more`` says whether another page is already available. Versions
+    are stamped when their transaction commits, in commit order, so a change
+    never becomes visible below a cursor already handed out.
+    """
+    events = (
+        PublicEvent.query.filter(PublicEvent.version > since)
+        .order_by(PublicEvent.version)
+        .limit(limit + 1)
+        .all()
+    )
+    tombstones = (
+        EventTombstone.query.filter(EventTombstone.version > since)
+        .order_by(EventTombstone.version)
+        .limit(limit + 1)
+        .all()
+    )
+
+    changes = sorted(
+        [(event.version, event) for event in events]
+        + [(tombstone.version, tombstone) for tombstone in tombstones],
+        key=lambda change: change[0],
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    return {
+        "events": _project(
+            [c.serialized for _, c in changes if isinstance(c, PublicEvent)],
+            projection,
+        ),
+        "deleted": [c.event_id for _, c in changes if isinstance(c, EventTombstone)],
+        "version": changes[-1][0] if changes else since,
+        "has_more": has_more,
+    }
+
+
 def delete_event(event_id: int) -> None:
     event = Event.query.filter_by(id=event_id).first()
     if not event:
         raise EventNotFoundException(f"Event with ID {event_id} not found.")
 
+    start_datetime = event.start_datetime
+    _notify_change(event.id, event.status, None)
     db.session.delete(event)
     db.session.commit()
+    _invalidate_public(event_id, start_datetime)
 
 
 def update_event_status(event_id: int, status: str) -> Event:
@@ -184,35 +1052,279 @@ def update_event_status(event_id: int, status: str) -> Event:
     if not event:
         raise EventNotFoundException(f"Event with ID {event_id} not found.")
 
+    previous_status = event.status
     event.status = status
+    event.version = events_version_seq.next_value()
+    event.claimed_by = None
+    event.claimed_until = None
+    _refresh_public_event(event.id)
+    _notify_change(event.id, previous_status, status)
     db.session.commit()
+    _invalidate_public(event.id, event.start_datetime)
     return event
 
 
-def get_events_calendar() -> list[dict]:
-    dates_query = (
-        db.session.query(func.date(Event.start_datetime).label("date"))
-        .filter(Event.status == EventStatus.approved)
-        .group_by(func.date(Event.start_datetime))
-        .order_by(func.date(Event.start_datetime))
+# Calendar days are sent as datetimes at a fixed hour, as the frontend expects
+CALENDAR_DAY_TIME = time(17, 0)
+
+
+@replica_reads
+def get_events_calendar(
+    date_from: date | None = None, date_to: date | None = None, summary: bool = False
+) -> list[dict]:
+    if summary:
+        return cached(
+            cache_key("calendar-summary", date_from, date_to),
+            lambda: _query_calendar_summary(date_from, date_to),
+        )
+    return cached(
+        cache_key("calendar", date_from, date_to),
+        lambda: _query_events_calendar(date_from, date_to),
+    )
+
+
+def _calendar_date(day: date) -> str:
+    return datetime.combine(day, CALENDAR_DAY_TIME).isoformat()
+
+
+def _calendar_occurrences(
+    date_from: date | None, date_to: date | None
+) -> list[tuple[dict, datetime]]:
+    """(series, start) of the occurrences starting between the two days."""
+    after = datetime.combine(date_from, time.min) if date_from else None
+    before = (
+        datetime.combine(date_to + timedelta(days=1), time.min)
+        if date_to
+        else horizon(after)
+    )
+    query = PublicEvent.query.filter(
+        PublicEvent.recurrence.isnot(None), PublicEvent.start_datetime < before
     )
+    if after:
+        query = query.filter(
+            or_(
+                PublicEvent.recurrence_until.is_(None),
+                PublicEvent.recurrence_until >= after,
+            )
+        )
+
+    found = []
+    for series in query.order_by(PublicEvent.id):
+        serialized = series.serialized
+        for start, _ in _series_occurrences(serialized, after, before):
+            if (after is None or start >= after) and start < before:
+                found.append((serialized, start))
+    return found
+
+
+def _query_events_calendar(
+    date_from: date | None = None, date_to: date | None = None
+) -> list[dict]:
+    day = func.date(PublicEvent.start_datetime)
+    order = (PublicEvent.start_datetime, PublicEvent.id)
+    query = db.session.query(
+        day.label("day"),
+        func.array_agg(aggregate_order_by(PublicEvent.id, *order)).label("event_ids"),
+        func.array_agg(aggregate_order_by(PublicEvent.start_datetime, *order)).label(
+            "starts"
+        ),
+    ).filter(PublicEvent.recurrence.is_(None))
+    if date_from:
+        query = query.filter(PublicEvent.start_datetime >= date_from)
+    if date_to:
+        query = query.filter(PublicEvent.start_datetime < date_to + timedelta(days=1))
 
-    result = []
-    for row in dates_query.all():
-        event_ids = [
-            event.id
-            for event in Event.query.filter(
-                func.date(Event.start_datetime) == row.date,
-                Event.status == EventStatus.approved,
-            ).all()
+    days = {
+        row.day: list(zip(row.starts, row.event_ids))
+        for row in query.group_by(day).all()
+    }
+    for series, start in _calendar_occurrences(date_from, date_to):
+        days.setdefault(start.date(), []).append((start, series["id"]))
+
+    return [
+        {
+            "date": _calendar_date(day),
+            "event_ids": [event_id for _, event_id in sorted(events)],
+        }
+        for day, events in sorted(days.items())
+    ]
+
+
+def _query_calendar_summary(
+    date_from: date | None = None, date_to: date | None = None
+) -> list[dict]:
+    """
+    Per-day counts from ``event_day_rollup``, one small row per day, plus the
+    occurrences of recurring series, which the rollup leaves out.
+    """
+    query = EventDayRollup.query
+    if date_from:
+        query = query.filter(EventDayRollup.day >= date_from)
+    if date_to:
+        query = query.filter(EventDayRollup.day <= date_to)
+
+    days = {}
+    for row in query.order_by(EventDayRollup.day).all():
+        summary = days.setdefault(
+            row.day, {"total": 0, "tags": {}, "state": {}, "online": {}}
+        )
+        if row.dimension == "total":
+            summary["total"] = row.event_count
+        elif row.dimension == "tag":
+            summary["tags"][row.value] = row.event_count
+        elif row.dimension == "state":
+            summary["state"][row.value] = row.event_count
+        elif row.dimension == "online":
+            summary["online"][row.value] = row.event_count
+
+    for series, start in _calendar_occurrences(date_from, date_to):
+        summary = days.setdefault(
+            start.date(), {"total": 0, "tags": {}, "state": {}, "online": {}}
+        )
+        summary["total"] += 1
+        values = [("tags", tag) for tag in series["tags"]]
+        values += [
+            ("state", series["state"]),
+            ("online", "true" if series["online"] else "false"),
         ]
+        for kind, value in values:
+            summary[kind][value] = summary[kind].get(value, 0) + 1
+
+    return [
+        {"date": _calendar_date(day), **summary}
+        for day, summary in sorted(days.items())
+    ]
+
+
+def archive_public_partitions(before_year: int) -> list[str]:
+    """
+    Detach the yearly ``public_events`` partitions older than ``before_year``.
+
+    Each one is kept as a plain ``public_events_<year>_archived`` table, out of
+    every public listing; its events still exist in ``events`` and can be read
+    by id. Every year before ``before_year`` is recorded in
+    ``archived_event_years``, so writing an event of those years does not
+    make it public again. Returns the names of the archived tables.
+    """
+    partitions = db.session.execute(
+        text(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'public_events'::regclass
+              AND c.relname ~ '^public_events_[0-9]{4}$'
+              AND substring(c.relname FROM '[0-9]{4}$')::integer < :before_year
+            ORDER BY c.relname
+            """
+        ),
+        {"before_year": before_year},
+    ).scalars()
+
+    archived = []
+    event_ids = []
+    days = set()
+    for name in list(partitions):
+        rows = db.session.execute(text(f"SELECT id, start_datetime FROM {name}")).all()
+        event_ids += [row.id for row in rows]
+        days |= {row.start_datetime.date() for row in rows}
+
+        # Detaching fires no row triggers: tombstones are written here, so
+        # /events/changes clients drop the events too, and the rollup is
+        # cleared below
+        db.session.execute(
+            text(
+                f"""
+                DELETE FROM event_tombstones WHERE event_id IN (SELECT id FROM {name});
+                INSERT INTO event_tombstones (event_id, version)
+                SELECT id, nextval('events_version_seq') FROM {name}
+                """
+            )
+        )
+        db.session.execute(text(f"ALTER TABLE public_events DETACH PARTITION {name}"))
+        _move_to_archive(name, f"{name}_archived")
+        archived.append(f"{name}_archived")
+
+    db.session.execute(
+        text(
+            """
+            INSERT INTO archived_event_years (year)
+            SELECT generate_series(
+                EXTRACT(YEAR FROM min(start_datetime))::integer, :before_year - 1
+            )
+            FROM events
+            HAVING min(start_datetime) IS NOT NULL
+            ON CONFLICT (year) DO NOTHING
+            """
+        ),
+        {"before_year": before_year},
+    )
+    db.session.query(EventDayRollup).filter(
+        EventDayRollup.day < date(before_year, 1, 1)
+    ).delete(synchronize_session=False)
+    db.session.commit()
+
+    _invalidate_public_many(event_ids, days)
+    return archived
+
 
-        # Converte a data do tipo date para datetime com hora fixa (ex: 17:00:00)
-        formatted_datetime = datetime.combine(
-            row.date, datetime.strptime("17:00:00", "%H:%M:%S").time()
+def _move_to_archive(name: str, archive: str) -> None:
+    """Rename a detached partition to ``archive``, or merge it into it."""
+    if db.session.execute(
+        text("SELECT to_regclass(:name)"), {"name": archive}
+    ).scalar():
+        # Archived by an earlier run: columns added since exist only in ``name``
+        columns = ", ".join(
+            db.session.execute(
+                text(
+                    """
+                    SELECT quote_ident(a.attname)
+                    FROM pg_attribute a
+                    JOIN pg_attribute b ON b.attname = a.attname
+                    WHERE a.attrelid = CAST(:archive AS regclass)
+                      AND b.attrelid = CAST(:name AS regclass)
+                      AND a.attnum > 0 AND NOT a.attisdropped AND a.attgenerated = ''
+                      AND NOT b.attisdropped
+                    ORDER BY a.attnum
+                    """
+                ),
+                {"archive": archive, "name": name},
+            ).scalars()
         )
-        iso_date = formatted_datetime.strftime("%Y-%m-%dT%H:%M:%S")
+        db.session.execute(
+            text(
+                f"INSERT INTO {archive} ({columns}) SELECT {columns} FROM {name} "
+                f"ON CONFLICT DO NOTHING"
+            )
+        )
+        db.session.execute(text(f"DROP TABLE {name}"))
+    else:
+        db.session.execute(text(f"ALTER TABLE {name} RENAME TO {archive}"))
+
 
-        result.append({"date": iso_date, "event_ids": event_ids})
+def locate_events() -> int:
+    """
+    Fill in the coordinates of events that have none from their
+    ``maps_link``, when it has them. Returns the number of events located.
+    """
+    events = Event.query.filter(
+        Event.latitude.is_(None), Event.maps_link.isnot(None)
+    ).all()
 
-    return result
+    located = []
+    for event in events:
+        _set_location(event, None, None)
+        if event.latitude is None:
+            continue
+        event.version = events_version_seq.next_value()
+        if event.status == EventStatus.approved:
+            _refresh_public_event(event.id)
+            _notify_change(event.id, event.status, event.status)
+        located.append(event)
+    db.session.commit()
+
+    _invalidate_public_many(
+        [event.id for event in located],
+        {event.start_datetime.date() for event in located},
+    )
+    return len(located)
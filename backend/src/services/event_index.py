@@ -0,0 +1,304 @@
+"""
+In-memory inverted index over approved events.
+
+Every indexed value (tag, state, online, is_free, currency and start day) maps
+to a bitmap of event slots. Bitmaps are plain Python ints: slots are dense, so
+an int is a compact bitset and ``&``/``|`` run in C over machine words.
+Filters from ``EventQuery`` become bitmap intersections; the few text and
+price filters that have no bitmap are checked on the surviving candidates.
+
+Recurring series are left out: their occurrences are expanded by the event
+services (see src/services/recurrence.py) and added to the index results.
+
+The index is loaded in the gunicorn master when ``preload_app`` is on, so
+workers start from a copy-on-write snapshot. Each worker then refreshes
+incrementally (see src/services/incremental.py): only events whose
+``version`` changed are reloaded.
+"""
+
+import bisect
+import logging
+from datetime import date, datetime
+
+from src.constants import EVENT_INDEX_MAX_AGE_SECONDS, REFERENCE_CURRENCY
+from src.models import db, ExchangeRate, PublicEvent
+from src.schemas import DateRangeMode, EventQuery, TagsMode
+from src.services.geo import distance_km
+from src.services.incremental import IncrementalIndex
+
+logger = logging.getLogger(__name__)
+
+
+def _positions(bits: int):
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+# Index key kinds reported as facets, and their name in the response
+FACET_KINDS = {
+    "tag": "tags",
+    "state": "state",
+    "online": "online",
+    "is_free": "is_free",
+}
+
+
+def _facet_value(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+class EventIndex(IncrementalIndex):
+    max_age = EVENT_INDEX_MAX_AGE_SECONDS
+
+    def __init__(self):
+        super().__init__()
+        self.slots: dict[int, int] = {}
+        self.events: list[dict | None] = []
+        self.ranges: list[tuple[datetime, datetime] | None] = []
+        self.prices: list[float | None] = []
+        self.rates: dict[str, float] = {}
+        self.free_slots: list[int] = []
+        self.all = 0
+        self.postings: dict[tuple[str, object], int] = {}
+        self.days: list[date] = []
+
+    def _keys(self, event: dict) -> list[tuple[str, object]]:
+        keys = [
+            ("state", event["state"]),
+            ("online", event["online"]),
+            ("is_free", event["is_free"]),
+            ("day", datetime.fromisoformat(event["start_datetime"]).date()),
+        ]
+        keys += [("tag", tag) for tag in event["tags"]]
+        keys += [
+            ("currency", intl["currency"])
+            for intl in event["intl"].values()
+            if intl["currency"]
+        ]
+        return list(dict.fromkeys(keys))
+
+    def _add(self, event: PublicEvent) -> None:
+        serialized = event.serialized
+        slot = self.free_slots.pop() if self.free_slots else len(self.events)
+        if slot == len(self.events):
+            self.events.append(None)
+            self.ranges.append(None)
+            self.prices.append(None)
+
+        self.events[slot] = serialized
+        self.ranges[slot] = (event.start_datetime, event.end_datetime)
+        self.prices[slot] = event.reference_price
+        self.slots[event.id] = slot
+
+        bit = 1 << slot
+        self.all |= bit
+        for key in self._keys(serialized):
+            if key[0] == "day" and key not in self.postings:
+                bisect.insort(self.days, key[1])
+            self.postings[key] = self.postings.get(key, 0) | bit
+
+    def _remove(self, event_id: int) -> None:
+        slot = self.slots.pop(event_id, None)
+        if slot is None:
+            return
+
+        mask = ~(1 << slot)
+        self.all &= mask
+        for key in self._keys(self.events[slot]):
+            remaining = self.postings[key] & mask
+            if remaining:
+                self.postings[key] = remaining
+            else:
+                del self.postings[key]
+                if key[0] == "day":
+                    self.days.remove(key[1])
+
+        self.events[slot] = None
+        self.ranges[slot] = None
+        self.prices[slot] = None
+        self.free_slots.append(slot)
+
+    def _current(self):
+        return super()._current().filter(PublicEvent.recurrence.is_(None))
+
+    def _refreshed(self, changed: bool) -> None:
+        # A new rate reprices events without changing their version
+        rates = {
+            currency.value: rate
+            for currency, rate in db.session.query(
+                ExchangeRate.currency, ExchangeRate.rate
+            )
+        }
+        if rates != self.rates:
+            prices = db.session.query(PublicEvent.id, PublicEvent.reference_price)
+            for event_id, price in prices.all():
+                if event_id in self.slots:
+                    self.prices[self.slots[event_id]] = price
+            self.rates = rates
+
+    def _any_of(self, keys) -> int:
+        bits = 0
+        for key in keys:
+            bits |= self.postings.get(key, 0)
+        return bits
+
+    def _days_between(self, start: date | None, end: date | None) -> int:
+        lo = bisect.bisect_left(self.days, start) if start else 0
+        hi = bisect.bisect_right(self.days, end) if end else len(self.days)
+        return self._any_of(("day", day) for day in self.days[lo:hi])
+
+    def search(self, filters: EventQuery | None) -> list[dict]:
+        """Evaluate ``filters`` against the index."""
+        self.refresh_if_stale()
+        # A concurrent refresh frees and reuses slots: read them under the lock
+        with self.lock:
+            events = self._collect(*self._match(filters))
+        if filters and filters.near:
+            latitude, longitude, _ = filters.parsed_near
+            events.sort(
+                key=lambda event: (
+                    distance_km(
+                        latitude, longitude, event["latitude"], event["longitude"]
+                    ),
+                    event["id"],
+                )
+            )
+        return events
+
+    def facets(self, filters: EventQuery | None) -> dict:
+        """Counts per tag, state, online and is_free among the matching events."""
+        self.refresh_if_stale()
+        with self.lock:
+            return self._facets(*self._match(filters))
+
+    def _facets(self, bits: int, matches=None) -> dict:
+        facets = {"total": 0, "tags": {}, "state": {}, "online": {}, "is_free": {}}
+        if matches is None:
+            # Every candidate matches: each count is one AND and a popcount
+            facets["total"] = bits.bit_count()
+            for (kind, value), posting in self.postings.items():
+                if kind in FACET_KINDS and value is not None:
+                    count = (bits & posting).bit_count()
+                    if count:
+                        facets[FACET_KINDS[kind]][_facet_value(value)] = count
+            return facets
+
+        for slot in _positions(bits):
+            if not matches(slot):
+                continue
+            event = self.events[slot]
+            facets["total"] += 1
+            for kind, value in self._keys(event):
+                if kind in FACET_KINDS and value is not None:
+                    counts = facets[FACET_KINDS[kind]]
+                    value = _facet_value(value)
+                    counts[value] = counts.get(value, 0) + 1
+        return facets
+
+    def _match(self, filters: EventQuery | None):
+        """
+        The candidate bitmap for ``filters`` and the check for the filters
+        that have no bitmap (``None`` when every candidate matches).
+        """
+        bits = self.all
+        if not filters:
+            return bits, None
+
+        price_min = price_max = None
+        if filters.price_min is not None or filters.price_max is not None:
+            # Like the SQL path, bounds in a currency without a rate match nothing
+            rate = self.rates.get(
+                filters.currency.value if filters.currency else REFERENCE_CURRENCY
+            )
+            if rate is None:
+                return 0, None
+            if filters.price_min is not None:
+                price_min = filters.price_min * rate
+            if filters.price_max is not None:
+                price_max = filters.price_max * rate
+
+        near = filters.parsed_near
+        date_from = filters.date_from
+        range_start = range_end = None
+        if filters.date_start_range and filters.date_end_range:
+            range_start = filters.date_start_range
+            range_end = filters.date_end_range
+        overlaps = filters.date_range_mode == DateRangeMode.overlaps
+
+        tags = filters.parsed_tags
+        if tags and filters.tags_mode == TagsMode.all:
+            for tag in tags:
+                bits &= self.postings.get(("tag", tag), 0)
+        elif tags:
+            bits &= self._any_of(("tag", tag) for tag in tags)
+        if filters.state:
+            bits &= self.postings.get(("state", filters.state.value), 0)
+        if filters.online is not None:
+            bits &= self.postings.get(("online", filters.online), 0)
+        if filters.is_free is not None:
+            bits &= self.postings.get(("is_free", filters.is_free), 0)
+        if filters.currency:
+            bits &= self.postings.get(("currency", filters.currency.value), 0)
+        if date_from:
+            bits &= self._days_between(date_from.date(), None)
+        if range_start and overlaps:
+            bits &= self._days_between(None, range_end.date())
+        elif range_start:
+            bits &= self._days_between(range_start.date(), range_end.date())
+
+        if not (
+            date_from
+            or range_start
+            or filters.name
+            or filters.org
+            or filters.address
+            or near
+            or price_min is not None
+            or price_max is not None
+        ):
+            return bits, None
+
+        def matches(slot: int) -> bool:
+            event = self.events[slot]
+            start, end = self.ranges[slot]
+            if date_from and start < date_from:
+                return False
+            if range_start and overlaps:
+                if start > range_end or max(start, end) < range_start:
+                    return False
+            elif range_start and (start < range_start or end > range_end):
+                return False
+            for field, value in (
+                ("event_name", filters.name),
+                ("organization_name", filters.org),
+                ("address", filters.address),
+            ):
+                if value and value.lower() not in (event[field] or "").lower():
+                    return False
+            if near:
+                latitude, longitude = event["latitude"], event["longitude"]
+                if (
+                    latitude is None
+                    or distance_km(*near[:2], latitude, longitude) > near[2]
+                ):
+                    return False
+            price = self.prices[slot]
+            if price_min is not None and (price is None or price < price_min):
+                return False
+            if price_max is not None and (price is None or price > price_max):
+                return False
+            return True
+
+        return bits, matches
+
+    def _collect(self, bits: int, matches=None) -> list[dict]:
+        slots = [slot for slot in _positions(bits) if matches is None or matches(slot)]
+        slots.sort(key=lambda slot: (self.ranges[slot][0], self.events[slot]["id"]))
+        return [self.events[slot] for slot in slots]
+
+
+event_index = EventIndex()
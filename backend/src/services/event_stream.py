@@ -0,0 +1,120 @@
+"""
+Fan-out of public event changes to ``/events/stream`` subscribers.
+
+The event services ``NOTIFY`` on ``EVENTS_NOTIFY_CHANNEL`` in the same
+transaction as the write, so Postgres delivers the message only on commit.
+Each worker keeps a single ``LISTEN`` connection in a background thread and
+copies every message into the queue of each of its SSE subscribers; the
+public event is read once per message, not once per subscriber.
+"""
+
+import json
+import logging
+import queue
+import select
+import threading
+import time
+
+from src.constants import (
+    EVENTS_NOTIFY_CHANNEL,
+    STREAM_MAX_SUBSCRIBERS,
+    STREAM_QUEUE_SIZE,
+)
+from src.exceptions import StreamUnavailableException
+from src.models import db, PublicEvent
+
+logger = logging.getLogger(__name__)
+
+LISTEN_POLL_SECONDS = 5
+RECONNECT_DELAY_SECONDS = 5
+
+
+class EventBroadcaster:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers: set[queue.Queue] = set()
+        self.thread: threading.Thread | None = None
+        self.app = None
+
+    def subscribe(self, app) -> queue.Queue:
+        """Register a subscriber, starting the listener thread on first use."""
+        with self.lock:
+            if len(self.subscribers) >= STREAM_MAX_SUBSCRIBERS:
+                raise StreamUnavailableException()
+            subscriber = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+            self.subscribers.add(subscriber)
+
+            # Threads do not survive a fork, so each worker starts its own
+            if self.thread is None or not self.thread.is_alive():
+                self.app = app
+                self.thread = threading.Thread(
+                    target=self._listen, name="event-stream-listener", daemon=True
+                )
+                self.thread.start()
+            return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def _publish(self, message: dict) -> None:
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # A client that stopped reading is dropped instead of
+                # buffering without bound; it reconnects and resyncs
+                self.unsubscribe(subscriber)
+                with subscriber.mutex:
+                    subscriber.queue.clear()
+                subscriber.put_nowait(None)
+
+    def _message(self, payload: str) -> dict | None:
+        try:
+            change = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.error(f"[stream] Invalid notification payload: {payload}")
+            return None
+
+        if change["change"] != "removed":
+            with self.app.app_context():
+                event = db.session.get(PublicEvent, change["id"])
+                if event is None:
+                    return None
+                change["event"] = event.serialized
+        return change
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                with self.app.app_context():
+                    # Detached from the pool: held for the life of the worker
+                    connection = db.engine.raw_connection()
+                    connection.detach()
+                listener = connection.driver_connection
+                listener.autocommit = True
+                listener.cursor().execute(f"LISTEN {EVENTS_NOTIFY_CHANNEL}")
+                logger.info(f"[stream] Listening on {EVENTS_NOTIFY_CHANNEL}")
+
+                try:
+                    while True:
+                        if not select.select([listener], [], [], LISTEN_POLL_SECONDS)[
+                            0
+                        ]:
+                            continue
+                        listener.poll()
+                        while listener.notifies:
+                            notify = listener.notifies.pop(0)
+                            message = self._message(notify.payload)
+                            if message:
+                                self._publish(message)
+                finally:
+                    connection.close()
+            except Exception as e:
+                logger.error(f"[stream] Listener error, reconnecting: {e}")
+                time.sleep(RECONNECT_DELAY_SECONDS)
+
+
+event_broadcaster = EventBroadcaster()
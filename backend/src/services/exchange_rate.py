@@ -0,0 +1,24 @@
+"""
+Exchange rates used to compare event prices across currencies.
+
+Rates are kept by hand with ``flask exchange-rate``. A trigger on
+``exchange_rates`` recomputes ``public_events.reference_price`` for the
+events priced in the changed currency.
+"""
+
+from src.models import db, Currency, ExchangeRate
+from src.services.cache import invalidate
+from src.services.replica import note_write
+
+
+def set_exchange_rate(currency: Currency, rate: float) -> ExchangeRate:
+    exchange_rate = db.session.get(ExchangeRate, currency)
+    if exchange_rate is None:
+        exchange_rate = ExchangeRate(currency=currency)
+        db.session.add(exchange_rate)
+    exchange_rate.rate = rate
+    db.session.commit()
+
+    note_write()
+    invalidate()
+    return exchange_rate
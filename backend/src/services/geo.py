@@ -0,0 +1,146 @@
+"""
+Coordinates of in-person events and proximity search over them.
+
+Each located event stores a geohash of its coordinates. Geohashes are
+prefix codes: every point inside a cell shares the cell's prefix, so "events
+in this cell" is a range scan on a btree index of the column. A ``near``
+search reads the cell around the point and its eight neighbours, with cells
+at least as large as the radius, and then checks the exact distance.
+"""
+
+import math
+import re
+from urllib.parse import parse_qs, urlparse
+
+from sqlalchemy import func
+
+from src.constants import GEOHASH_PRECISION
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+_NUMBER = r"(-?\d{1,3}(?:\.\d+)?)"
+# Place pin (!3d<lat>!4d<lng>), then map center (@<lat>,<lng>)
+_LINK_PATTERNS = (
+    re.compile(rf"!3d{_NUMBER}!4d{_NUMBER}"),
+    re.compile(rf"@{_NUMBER},{_NUMBER}"),
+)
+_QUERY_PATTERN = re.compile(rf"^\s*{_NUMBER}\s*,\s*{_NUMBER}\s*$")
+_QUERY_PARAMS = ("q", "query", "ll", "destination")
+
+
+def encode_geohash(latitude: float, longitude: float, precision=GEOHASH_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def _cell_size(precision: int) -> tuple[float, float]:
+    """(latitude, longitude) size in degrees of the cells of ``precision``."""
+    bits = 5 * precision
+    return 180 / 2 ** (bits // 2), 360 / 2 ** (bits - bits // 2)
+
+
+def covering_cells(latitude: float, longitude: float, radius_km: float):
+    """
+    Geohash prefixes whose cells cover the circle, or ``None`` when the
+    circle is too large for a 3x3 block of cells (near the poles).
+    """
+    lat_extent = radius_km / KM_PER_DEGREE
+    farthest = min(abs(latitude) + lat_extent, 89.9)
+    lng_extent = lat_extent / math.cos(math.radians(farthest))
+
+    precision = GEOHASH_PRECISION
+    while precision > 0:
+        cell_lat, cell_lng = _cell_size(precision)
+        if cell_lat >= lat_extent and cell_lng >= lng_extent:
+            break
+        precision -= 1
+    if precision == 0:
+        return None
+
+    cells = set()
+    for d_lat in (-cell_lat, 0, cell_lat):
+        lat = latitude + d_lat
+        if not -90 <= lat <= 90:
+            continue
+        for d_lng in (-cell_lng, 0, cell_lng):
+            lng = (longitude + d_lng + 180) % 360 - 180
+            cells.add(encode_geohash(lat, lng, precision))
+    return sorted(cells)
+
+
+def cell_ranges(cells: list[str]) -> list[tuple[str, str]]:
+    """
+    ``[low, high)`` bounds of the geohashes inside ``cells`` (sorted), with
+    neighbouring cells such as ``6gw``/``6gx`` merged into one range.
+    """
+    ranges = []
+    for cell in cells:
+        # The next character of the alphabet, or one past "z" in "C" collation
+        position = BASE32.index(cell[-1]) + 1
+        successor = BASE32[position] if position < len(BASE32) else "{"
+        low, high = cell, cell[:-1] + successor
+        if ranges and ranges[-1][1] == low:
+            low = ranges.pop()[0]
+        ranges.append((low, high))
+    return ranges
+
+
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle (haversine) distance."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def distance_km_sql(latitude, longitude, lat: float, lng: float):
+    """``distance_km`` as a SQL expression over the ``latitude``/``longitude`` columns."""
+    a = func.power(func.sin(func.radians(latitude - lat) / 2), 2) + func.cos(
+        func.radians(lat)
+    ) * func.cos(func.radians(latitude)) * func.power(
+        func.sin(func.radians(longitude - lng) / 2), 2
+    )
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(func.least(a, 1.0)))
+
+
+def coordinates_from_maps_link(link: str | None) -> tuple[float, float] | None:
+    """Coordinates written in a map link, without any network lookup."""
+    if not link:
+        return None
+    candidates = [pattern.search(link) for pattern in _LINK_PATTERNS]
+    query = parse_qs(urlparse(link).query)
+    candidates += [
+        _QUERY_PATTERN.match(value)
+        for param in _QUERY_PARAMS
+        for value in query.get(param, [])
+    ]
+    for match in candidates:
+        if match:
+            latitude, longitude = float(match.group(1)), float(match.group(2))
+            if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+                return latitude, longitude
+    return None
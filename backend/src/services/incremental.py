@@ -0,0 +1,83 @@
+"""
+Base for the per-worker in-memory indexes over approved events (the event
+index, ``/suggest`` and ``/events/<id>/related``).
+
+Each index remembers the ``version`` of every event it holds. A refresh reads
+the current versions from ``public_events``, drops the events that left,
+reloads only those whose version changed, and records the cache generation it
+saw: requests refresh again once the generation moves or ``max_age`` seconds
+have passed, so writes from other workers are picked up too.
+"""
+
+import threading
+import time
+
+from src.models import db, PublicEvent
+from src.services.cache import current_generation
+
+
+class IncrementalIndex:
+    # Seconds after which a refresh is forced even if the generation is unchanged
+    max_age: float
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.generation = None
+        self.refreshed_at = 0.0
+        self.versions: dict[int, int] = {}
+
+    def _current(self):
+        """Query of the ``(id, version)`` of the events the index should hold."""
+        return db.session.query(PublicEvent.id, PublicEvent.version)
+
+    def _load(self, event_ids: list[int]):
+        """Query of the events in ``event_ids``, with the columns ``_add`` reads."""
+        return PublicEvent.query.filter(PublicEvent.id.in_(event_ids))
+
+    def _add(self, event: PublicEvent) -> None:
+        raise NotImplementedError
+
+    def _remove(self, event_id: int) -> None:
+        """Drop ``event_id``, which may not be in the index."""
+        raise NotImplementedError
+
+    def _refreshed(self, changed: bool) -> None:
+        """
+        Called under the lock at the end of each refresh, ``changed`` when
+        events were added, changed or removed (or on the first load).
+        """
+
+    def refresh(self) -> None:
+        """Bring the index up to date, reloading only added or changed events."""
+        with self.lock:
+            generation = current_generation()
+            current = dict(self._current().all())
+            removed = self.versions.keys() - current.keys()
+            for event_id in removed:
+                self._remove(event_id)
+                del self.versions[event_id]
+
+            changed = [
+                event_id
+                for event_id, version in current.items()
+                if self.versions.get(event_id) != version
+            ]
+            if changed:
+                for event in self._load(changed).all():
+                    self._remove(event.id)
+                    self._add(event)
+                    self.versions[event.id] = event.version
+
+            self._refreshed(bool(removed or changed) or not self.loaded)
+            self.generation = generation
+            self.refreshed_at = time.monotonic()
+            self.loaded = True
+
+    def refresh_if_stale(self) -> None:
+        if (
+            not self.loaded
+            or self.generation != current_generation()
+            or time.monotonic() - self.refreshed_at > self.max_age
+        ):
+            self.refresh()
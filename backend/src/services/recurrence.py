@@ -0,0 +1,150 @@
+"""
+Recurring events: a series is stored once and its occurrences are expanded
+on read.
+
+A series is an event with an RFC 5545 ``RRULE`` in ``recurrence``, such as
+``FREQ=MONTHLY;BYDAY=2TU`` or ``FREQ=WEEKLY;COUNT=10``. Its start and end are
+those of the first occurrence, and every occurrence lasts as long. Reads only
+expand the occurrences that fall inside the window they ask for.
+"""
+
+import re
+from collections import deque
+from datetime import datetime, time, timedelta
+
+from dateutil.parser import parse
+from dateutil.rrule import rrule, rrulestr
+
+from src.constants import (
+    RECURRENCE_HORIZON_DAYS,
+    RECURRENCE_MAX_COUNT,
+    RECURRENCE_MAX_OCCURRENCES,
+    RECURRENCE_MAX_STEPS,
+    RECURRENCE_MAX_UNTIL_YEARS,
+)
+
+# Finer frequencies would turn a short window into hundreds of occurrences
+ALLOWED_FREQUENCIES = ("YEARLY", "MONTHLY", "WEEKLY", "DAILY")
+
+_FREQ = re.compile(r"(?:^|;)FREQ=([A-Z]+)(?:;|$)")
+_BOUNDED = re.compile(r"(?:^|;)(?:COUNT|UNTIL)=")
+_COUNT = re.compile(r"(?:^|;)COUNT=(\d+)(?:;|$)")
+_UNTIL = re.compile(r"(?:^|;)UNTIL=([^;]+)")
+_INTERVAL = re.compile(r"(?:^|;)INTERVAL=([^;]*)")
+
+
+def normalize_rule(recurrence: str) -> str:
+    """
+    Validate an ``RRULE`` value, with or without the ``RRULE:`` prefix, and
+    return it without the prefix.
+    """
+    rule = recurrence.strip().upper()
+    if rule.startswith("RRULE:"):
+        rule = rule[len("RRULE:") :]
+    if "DTSTART" in rule or "\n" in rule:
+        raise ValueError(
+            "Only the RRULE value is accepted, the series starts at start_datetime"
+        )
+
+    frequency = _FREQ.search(rule)
+    if not frequency or frequency.group(1) not in ALLOWED_FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(ALLOWED_FREQUENCIES)}")
+    try:
+        parsed = rrulestr(rule, dtstart=datetime(2000, 1, 1))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid recurrence rule: {e}")
+    if not isinstance(parsed, rrule):
+        raise ValueError("Invalid recurrence rule")
+
+    # INTERVAL=0 repeats the first occurrence forever
+    interval = _INTERVAL.search(rule)
+    if interval and not (interval.group(1).isdigit() and int(interval.group(1)) >= 1):
+        raise ValueError("INTERVAL must be at least 1")
+    count = _COUNT.search(rule)
+    if count and int(count.group(1)) > RECURRENCE_MAX_COUNT:
+        raise ValueError(f"COUNT must be at most {RECURRENCE_MAX_COUNT}")
+    until = _UNTIL.search(rule)
+    if until:
+        limit = datetime.now().year + RECURRENCE_MAX_UNTIL_YEARS
+        if parse(until.group(1), ignoretz=True).year > limit:
+            raise ValueError(f"UNTIL must not be after {limit}")
+    return rule
+
+
+def _rule(recurrence: str, start: datetime) -> rrule:
+    return rrulestr(recurrence, dtstart=start)
+
+
+def last_end(recurrence: str, start: datetime, end: datetime) -> datetime | None:
+    """
+    End of the last occurrence, ``None`` for a series without COUNT or UNTIL.
+    Raises ``ValueError`` past ``RECURRENCE_MAX_COUNT`` occurrences, so the
+    walk to the last one stays short.
+    """
+    if not _BOUNDED.search(recurrence):
+        return None
+    last = start
+    for count, last in enumerate(_rule(recurrence, start), 1):
+        if count > RECURRENCE_MAX_COUNT:
+            raise ValueError(
+                f"A series can have at most {RECURRENCE_MAX_COUNT} occurrences"
+            )
+    return last + (end - start)
+
+
+def _walk(starts):
+    """
+    ``starts`` while they move forward, for at most ``RECURRENCE_MAX_STEPS``:
+    a rule that stops producing new occurrences cannot spin forever.
+    """
+    previous = None
+    for step, occurrence in enumerate(starts):
+        if step >= RECURRENCE_MAX_STEPS or (
+            previous is not None and occurrence <= previous
+        ):
+            return
+        yield occurrence
+        previous = occurrence
+
+
+def occurrences(
+    recurrence: str,
+    start: datetime,
+    end: datetime,
+    after: datetime | None,
+    before: datetime,
+) -> list[tuple[datetime, datetime]]:
+    """
+    (start, end) of the occurrences that end at or after ``after`` and start
+    at or before ``before``, at most ``RECURRENCE_MAX_OCCURRENCES``.
+
+    Past the cap, a window with an ``after`` keeps its first occurrences. One
+    without keeps its last, the ones closest to ``before``: the window then
+    runs from the start of the series, and its first occurrences may be years
+    in the past. No more than ``RECURRENCE_MAX_STEPS`` occurrences are walked.
+    """
+    duration = end - start
+    rule = _rule(recurrence, start)
+    if after is None:
+        found = deque(maxlen=RECURRENCE_MAX_OCCURRENCES)
+        for occurrence in _walk(rule.xafter(start, inc=True)):
+            if occurrence > before:
+                break
+            found.append((occurrence, occurrence + duration))
+        return list(found)
+
+    found = []
+    for occurrence in _walk(rule.xafter(after - duration, inc=True)):
+        if occurrence > before or len(found) >= RECURRENCE_MAX_OCCURRENCES:
+            break
+        found.append((occurrence, occurrence + duration))
+    return found
+
+
+def horizon(after: datetime | None) -> datetime:
+    """
+    End of an expansion window that has none, ``RECURRENCE_HORIZON_DAYS``
+    ahead. Rounded to a day so the same window is cached all day.
+    """
+    day = max(datetime.now(), after or datetime.min).date()
+    return datetime.combine(day + timedelta(days=RECURRENCE_HORIZON_DAYS), time.min)
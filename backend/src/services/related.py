@@ -0,0 +1,154 @@
+"""
+Related events for ``/events/<id>/related``, by tag similarity.
+
+Approved events and their tags form a sparse event x tag matrix, kept per
+worker as one posting set of event ids per tag. Tags are weighted by inverse
+document frequency, so sharing a rare tag counts for more than sharing
+"python", and two events are compared by the cosine of their weighted tag
+vectors. Ranking the events related to one event is a sparse product: only
+the postings of its own tags are visited.
+
+The model refreshes incrementally (see src/services/incremental.py): when the
+cache generation moves, only events whose ``version`` changed are reloaded,
+then the weights and norms are recomputed. Rankings are memoized until the next
+refresh, so repeated requests for an event are a lookup; one is ranked again
+when events that ended since leave it short of the limit asked for.
+"""
+
+import heapq
+import math
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy.orm import load_only
+
+from src.constants import RELATED_INDEX_MAX_AGE_SECONDS, RELATED_MAX_LIMIT
+from src.exceptions import EventNotFoundException
+from src.models import PublicEvent
+from src.schemas import EventProjectionQuery
+from src.services.event import get_events_by_ids
+from src.services.incremental import IncrementalIndex
+
+
+class RelatedIndex(IncrementalIndex):
+    max_age = RELATED_INDEX_MAX_AGE_SECONDS
+
+    def __init__(self):
+        super().__init__()
+        self.tags: dict[int, tuple[str, ...]] = {}
+        # When each event is over, None for a series that never ends
+        self.ends: dict[int, datetime | None] = {}
+        self.postings: dict[str, set[int]] = {}
+        self.weights: dict[str, float] = {}
+        self.norms: dict[int, float] = {}
+        self.rankings: dict[int, list[int]] = {}
+
+    def _add(self, event: PublicEvent) -> None:
+        tags = tuple(dict.fromkeys(event.tags))
+        self.tags[event.id] = tags
+        self.ends[event.id] = (
+            event.recurrence_until if event.recurrence else event.end_datetime
+        )
+        for tag in tags:
+            self.postings.setdefault(tag, set()).add(event.id)
+
+    def _remove(self, event_id: int) -> None:
+        self.ends.pop(event_id, None)
+        for tag in self.tags.pop(event_id, ()):
+            self.postings[tag].discard(event_id)
+            if not self.postings[tag]:
+                del self.postings[tag]
+
+    def _reweight(self) -> None:
+        """Smoothed IDF of each tag, and the norm of each event's tag vector."""
+        count = len(self.tags)
+        self.weights = {
+            tag: math.log((1 + count) / (1 + len(events))) + 1
+            for tag, events in self.postings.items()
+        }
+        self.norms = {
+            event_id: math.sqrt(sum(self.weights[tag] ** 2 for tag in tags))
+            for event_id, tags in self.tags.items()
+        }
+
+    def _load(self, event_ids: list[int]):
+        return (
+            super()
+            ._load(event_ids)
+            .options(
+                load_only(
+                    PublicEvent.id,
+                    PublicEvent.version,
+                    PublicEvent.tags,
+                    PublicEvent.end_datetime,
+                    PublicEvent.recurrence,
+                    PublicEvent.recurrence_until,
+                )
+            )
+        )
+
+    def _refreshed(self, changed: bool) -> None:
+        if changed:
+            self._reweight()
+            self.rankings = {}
+
+    def _upcoming(self, event_id: int, now: datetime) -> bool:
+        end = self.ends[event_id]
+        return end is None or end >= now
+
+    def _rank(self, event_id: int) -> list[int]:
+        """The ``RELATED_MAX_LIMIT`` upcoming events most similar to ``event_id``."""
+        products = defaultdict(float)
+        for tag in self.tags[event_id]:
+            weight = self.weights[tag] ** 2
+            for other in self.postings[tag]:
+                products[other] += weight
+        products.pop(event_id, None)
+
+        now = datetime.now()
+        norm = self.norms[event_id]
+        best = heapq.nlargest(
+            RELATED_MAX_LIMIT,
+            (
+                (product / (norm * self.norms[other]), -other)
+                for other, product in products.items()
+                if self._upcoming(other, now)
+            ),
+        )
+        return [-negated for _, negated in best]
+
+    def related(self, event_id: int, limit: int) -> list[int] | None:
+        """
+        Ids of the upcoming events most similar to ``event_id``, best first.
+        ``None`` when ``event_id`` is not an approved event.
+        """
+        self.refresh_if_stale()
+        with self.lock:
+            if event_id not in self.tags:
+                return None
+            ranking = self.rankings.get(event_id)
+            upcoming = None
+            if ranking is not None:
+                # Drop events that ended since it was ranked. A full ranking
+                # left short may be missing events ranked below its cut
+                now = datetime.now()
+                upcoming = [other for other in ranking if self._upcoming(other, now)]
+                if len(upcoming) < limit and len(ranking) == RELATED_MAX_LIMIT:
+                    upcoming = None
+            if upcoming is None:
+                upcoming = self.rankings[event_id] = self._rank(event_id)
+            return upcoming[:limit]
+
+
+related_index = RelatedIndex()
+
+
+def get_related_events(
+    event_id: int, limit: int, projection: EventProjectionQuery | None = None
+) -> list[dict]:
+    """Serialized upcoming events related to ``event_id``, most similar first."""
+    related = related_index.related(event_id, limit)
+    if related is None:
+        raise EventNotFoundException(f"Event with ID {event_id} not found.")
+    events, _ = get_events_by_ids(related, projection)
+    return events
@@ -0,0 +1,168 @@
+"""
+Routing of public reads to a Postgres read replica.
+
+The replica is the ``replica`` bind, configured when ``POSTGRES_REPLICA_HOST``
+is set. Service functions decorated with ``replica_reads`` send their queries
+there; moderation, submissions and every write keep using the primary.
+
+A read only goes to the replica when it is reachable and has replayed the
+WAL position of the latest write. After a write, ``note_write`` records the
+primary's position next to the cache generation, so no worker refills the
+cache from a replica that is behind. The position is also handed to the
+client as a cookie, so a moderator who just approved an event keeps reading
+from the primary until the replica has caught up, whichever host serves them.
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql.dml import UpdateBase
+
+from src.constants import (
+    REPLICA_BIND,
+    REPLICA_CHECK_SECONDS,
+    REPLICA_RETRY_SECONDS,
+)
+from src.services.cache import last_write_lsn, record_write_lsn
+
+logger = logging.getLogger(__name__)
+
+_reads_on_replica: ContextVar[bool] = ContextVar("reads_on_replica", default=False)
+_replica_used: ContextVar[bool] = ContextVar("replica_used", default=False)
+_required_lsn: ContextVar[int] = ContextVar("required_lsn", default=0)
+
+_lock = threading.Lock()
+_state = {"checked_at": float("-inf"), "replay_lsn": None}
+
+
+def parse_lsn(lsn: str) -> int:
+    high, low = lsn.split("/")
+    return (int(high, 16) << 32) | int(low, 16)
+
+
+def _replay_lsn(engine) -> int | None:
+    """
+    WAL position the replica has replayed, ``None`` while it is unreachable.
+
+    Checked by one request at a time, at most every ``REPLICA_CHECK_SECONDS``
+    (``REPLICA_RETRY_SECONDS`` after a failure). The replayed position only
+    moves forward, so a slightly old reading is still a safe lower bound.
+    """
+    now = time.monotonic()
+    with _lock:
+        interval = REPLICA_CHECK_SECONDS
+        if _state["replay_lsn"] is None:
+            interval = REPLICA_RETRY_SECONDS
+        if now - _state["checked_at"] < interval:
+            return _state["replay_lsn"]
+        _state["checked_at"] = now
+
+    try:
+        with engine.connect() as connection:
+            lsn = connection.execute(
+                text(
+                    "SELECT CASE WHEN pg_is_in_recovery() "
+                    "THEN pg_last_wal_replay_lsn() ELSE pg_current_wal_lsn() END"
+                )
+            ).scalar()
+        replay_lsn = parse_lsn(lsn) if lsn else None
+    except OperationalError as e:
+        logger.warning(f"[replica] Unreachable, reading from the primary: {e}")
+        replay_lsn = None
+
+    with _lock:
+        _state["replay_lsn"] = replay_lsn
+    return replay_lsn
+
+
+def _required() -> int:
+    """WAL position a replica must have replayed to serve this read."""
+    required = _required_lsn.get()
+    lsn = last_write_lsn()
+    if lsn:
+        required = max(required, parse_lsn(lsn))
+    return required
+
+
+def mark_unhealthy() -> None:
+    with _lock:
+        _state["checked_at"] = time.monotonic()
+        _state["replay_lsn"] = None
+
+
+class ReplicaRoutingSession(Session):
+    """Sends reads inside ``replica_reads`` to the replica bind when it can."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and _reads_on_replica.get()
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+        ):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                replay_lsn = _replay_lsn(replica)
+                if replay_lsn is not None and replay_lsn >= _required():
+                    _replica_used.set(True)
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_reads(func):
+    """
+    Run the queries of ``func`` on the replica when possible.
+
+    If the replica fails mid-request, it is marked down and ``func`` is run
+    again on the primary.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        reads_token = _reads_on_replica.set(True)
+        used_token = _replica_used.set(False)
+        try:
+            return func(*args, **kwargs)
+        except OperationalError:
+            if not _replica_used.get():
+                raise
+            from src.models import db
+
+            logger.error("[replica] Query failed, retrying on the primary")
+            mark_unhealthy()
+            db.session.rollback()
+            _reads_on_replica.set(False)
+            return func(*args, **kwargs)
+        finally:
+            _replica_used.reset(used_token)
+            _reads_on_replica.reset(reads_token)
+
+    return wrapper
+
+
+def require_lsn(lsn: str | None) -> None:
+    """Set the WAL position reads in this request must see (``None`` for none)."""
+    try:
+        _required_lsn.set(parse_lsn(lsn) if lsn else 0)
+    except ValueError:
+        _required_lsn.set(0)
+
+
+def note_write() -> None:
+    """Require the primary's current WAL position for the rest of the request."""
+    from src.models import db
+
+    if REPLICA_BIND not in db.engines:
+        return
+    lsn = db.session.execute(text("SELECT pg_current_wal_lsn()")).scalar()
+    _required_lsn.set(max(_required_lsn.get(), parse_lsn(lsn)))
+    record_write_lsn(lsn)
+    if has_request_context():
+        g.write_lsn = lsn
@@ -0,0 +1,123 @@
+"""
+Review queue leases.
+
+Leases coordinate moderators, they do not authorize them: management tokens
+are shared and carry no identity, so ``moderator`` is whatever name the
+client sends, and status changes ignore who holds an event's lease.
+"""
+
+from datetime import timedelta
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import joinedload
+
+from src.exceptions import EventNotFoundException, ReviewClaimConflictException
+from src.models import db, Event, EventStatus
+
+
+def _lease_is_free():
+    return or_(Event.claimed_until.is_(None), Event.claimed_until < func.now())
+
+
+def claim_pending_events(moderator: str, limit: int, lease_seconds: int) -> list[dict]:
+    """
+    Lease a batch of pending events to a moderator.
+
+    Rows locked by a concurrent claim are skipped instead of waited on, so two
+    moderators claiming at the same time always get disjoint batches. Events
+    already leased to the same moderator are handed back and their lease renewed.
+    """
+    claimable = (
+        select(Event.id)
+        .where(
+            Event.status == EventStatus.requested,
+            or_(_lease_is_free(), Event.claimed_by == moderator),
+        )
+        .order_by(Event.created_at, Event.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    event_ids = db.session.execute(claimable).scalars().all()
+    if not event_ids:
+        db.session.commit()
+        return []
+
+    db.session.execute(
+        update(Event)
+        .where(Event.id.in_(event_ids))
+        .values(
+            claimed_by=moderator,
+            claimed_until=func.now() + timedelta(seconds=lease_seconds),
+        )
+    )
+    db.session.commit()
+
+    events = (
+        Event.query.options(joinedload(Event.intl), joinedload(Event.tags))
+        .filter(Event.id.in_(event_ids))
+        .order_by(Event.created_at, Event.id)
+        .all()
+    )
+    return [serialize_claimed(e) for e in events]
+
+
+def release_claim(event_id: int, moderator: str) -> None:
+    event = (
+        Event.query.filter_by(id=event_id, status=EventStatus.requested)
+        .with_for_update()
+        .first()
+    )
+    if not event:
+        db.session.rollback()
+        raise EventNotFoundException(f"Pending event with ID {event_id} not found.")
+
+    if event.claimed_by and event.claimed_by != moderator:
+        db.session.rollback()
+        raise ReviewClaimConflictException(
+            f"Event with ID {event_id} is claimed by another moderator."
+        )
+
+    event.claimed_by = None
+    event.claimed_until = None
+    db.session.commit()
+
+
+def get_review_queue_stats() -> dict:
+    """
+    Summarise the pending queue.
+
+    Only touches rows covered by the partial index on requested events, so it
+    stays cheap regardless of how many approved events exist.
+    """
+    row = db.session.execute(
+        select(
+            func.count().label("pending"),
+            func.count().filter(Event.claimed_until >= func.now()).label("claimed"),
+            func.min(Event.created_at).label("oldest_created_at"),
+            func.extract("epoch", func.now() - func.min(Event.created_at)).label(
+                "oldest_age_seconds"
+            ),
+        ).where(Event.status == EventStatus.requested)
+    ).one()
+
+    return {
+        "pending": row.pending,
+        "claimed": row.claimed,
+        "unclaimed": row.pending - row.claimed,
+        "oldest_created_at": (
+            row.oldest_created_at.isoformat() if row.oldest_created_at else None
+        ),
+        "oldest_age_seconds": (
+            int(row.oldest_age_seconds) if row.oldest_age_seconds is not None else None
+        ),
+    }
+
+
+def serialize_claimed(event: Event) -> dict:
+    return {
+        **event.serialized,
+        "claimed_by": event.claimed_by,
+        "claimed_until": (
+            event.claimed_until.isoformat() if event.claimed_until else None
+        ),
+    }
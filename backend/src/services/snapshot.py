@@ -0,0 +1,217 @@
+"""
+Static JSON snapshots of the public API for a CDN or nginx to serve.
+
+Every document is written once under a content-hashed name and listed in
+``manifest.json``, which maps the logical name (``calendar.json``,
+``events/2025-04.json``, ``event/12.json``) to the hashed file. Hashed files
+never change, so they can be cached forever; only the manifest is short-lived.
+
+Month documents are rendered through ``get_events``, so they list the
+occurrences of recurring series in every month they fall in, like ``/events``.
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+
+from src.constants import SNAPSHOT_DIR
+from src.models import db, PublicEvent
+from src.schemas import DateRangeMode, EventQuery
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+
+
+def _month_start(month: date) -> datetime:
+    return datetime(month.year, month.month, 1)
+
+
+def _next_month_start(month: date) -> datetime:
+    if month.month == 12:
+        return datetime(month.year + 1, 1, 1)
+    return datetime(month.year, month.month + 1, 1)
+
+
+def _render_month(month: date) -> list[dict]:
+    # Imported here: the event services call back into this module on writes
+    from src.services.event import get_events
+
+    # Overlapping the month and starting in it: events and occurrences that
+    # start in the month
+    start = _month_start(month)
+    return get_events(
+        EventQuery(
+            date_from=start,
+            date_start_range=start,
+            date_end_range=_next_month_start(month) - timedelta(microseconds=1),
+            date_range_mode=DateRangeMode.overlaps,
+        )
+    )
+
+
+def _listed_months() -> set[date]:
+    """Months with an approved event or occurrence, up to the expansion horizon."""
+    from src.services.event import get_events
+
+    return {
+        datetime.fromisoformat(event["start_datetime"]).date().replace(day=1)
+        for event in get_events()
+    }
+
+
+def _render_calendar() -> list[dict]:
+    # Imported here: the event services call back into this module on writes
+    from src.services.event import get_events_calendar
+
+    return get_events_calendar()
+
+
+def _write_document(name: str, payload) -> dict:
+    body = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    digest = hashlib.sha256(body).hexdigest()
+    stem, ext = os.path.splitext(name)
+    hashed_name = f"{stem}.{digest[:16]}{ext}"
+
+    path = os.path.join(SNAPSHOT_DIR, hashed_name)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, path)
+    return {"path": hashed_name, "sha256": digest, "bytes": len(body)}
+
+
+def _read_manifest() -> dict:
+    try:
+        with open(
+            os.path.join(SNAPSHOT_DIR, MANIFEST_FILE), "r", encoding="utf-8"
+        ) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"files": {}}
+
+
+def _was_series(name: str, manifest: dict) -> bool:
+    """Whether the published document ``name`` is a recurring series."""
+    doc = manifest["files"].get(name)
+    if not doc:
+        return False
+    try:
+        with open(os.path.join(SNAPSHOT_DIR, doc["path"]), "r", encoding="utf-8") as f:
+            return bool(json.load(f).get("recurrence"))
+    except FileNotFoundError:
+        return False
+
+
+@contextmanager
+def _manifest_lock():
+    """
+    Held from rendering to the manifest swap: a render that read older data
+    can never be swapped in after a newer one.
+    """
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    with open(os.path.join(SNAPSHOT_DIR, f"{MANIFEST_FILE}.lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _update_manifest(documents: dict, removed: set[str], replace_all: bool) -> None:
+    """
+    Swap documents into the manifest and delete the files they replace.
+    Called with ``_manifest_lock`` held.
+    """
+    manifest_path = os.path.join(SNAPSHOT_DIR, MANIFEST_FILE)
+    manifest = _read_manifest()
+
+    previous = manifest["files"]
+    files = {} if replace_all else dict(previous)
+    files.update(documents)
+    for name in removed:
+        files.pop(name, None)
+
+    manifest = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "files": files,
+    }
+    tmp = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, manifest_path)
+
+    live = {doc["path"] for doc in files.values()}
+    for doc in previous.values():
+        if doc["path"] not in live:
+            try:
+                os.remove(os.path.join(SNAPSHOT_DIR, doc["path"]))
+            except FileNotFoundError:
+                pass
+
+
+def publish_changes(event_ids: set[int], months: set[date]) -> None:
+    """Regenerate the documents affected by a write to ``event_ids``."""
+    with _manifest_lock():
+        _publish_changes(event_ids, months)
+
+
+def _publish_changes(event_ids: set[int], months: set[date]) -> None:
+    manifest = _read_manifest()
+    documents = {"calendar.json": _write_document("calendar.json", _render_calendar())}
+    removed = set()
+    series = False
+    for event_id in event_ids:
+        name = f"event/{event_id}.json"
+        event = db.session.get(PublicEvent, event_id)
+        series = (
+            series or _was_series(name, manifest) or bool(event and event.recurrence)
+        )
+        if event:
+            documents[name] = _write_document(name, event.serialized)
+        else:
+            removed.add(name)
+
+    if series:
+        # A series, before or after the write, can occur in any month
+        months = months | _listed_months()
+        months |= {
+            datetime.strptime(name, "events/%Y-%m.json").date()
+            for name in manifest["files"]
+            if name.startswith("events/")
+        }
+    for month in months:
+        name = f"events/{month:%Y-%m}.json"
+        documents[name] = _write_document(name, _render_month(month))
+
+    _update_manifest(documents, removed, replace_all=False)
+
+
+def rebuild_snapshot() -> int:
+    """Render every document from scratch. Returns the number of documents."""
+    with _manifest_lock():
+        count = _rebuild_snapshot()
+    logger.info(f"[snapshot] {count} documents written to {SNAPSHOT_DIR}")
+    return count
+
+
+def _rebuild_snapshot() -> int:
+    events = PublicEvent.query.order_by(PublicEvent.start_datetime).all()
+    months = sorted(_listed_months())
+
+    documents = {"calendar.json": _write_document("calendar.json", _render_calendar())}
+    for month in months:
+        name = f"events/{month:%Y-%m}.json"
+        documents[name] = _write_document(name, _render_month(month))
+    for event in events:
+        name = f"event/{event.id}.json"
+        documents[name] = _write_document(name, event.serialized)
+
+    _update_manifest(documents, set(), replace_all=True)
+    return len(documents)
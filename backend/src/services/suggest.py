@@ -0,0 +1,131 @@
+"""
+Typeahead over the tags, organization names and event names of approved
+events, for ``/suggest``.
+
+Each worker keeps one sorted list of ``(key, value)`` per kind, where keys are
+normalized (no accents, case folded). A prefix is answered with a binary
+search for its first key and a scan of the keys that share it. Names are also
+keyed from the start of each of their words, so "brasil" finds "Python
+Brasil". Values are ranked by their number of approved events, a recurring
+series counting once.
+
+The lists are refreshed incrementally (see src/services/incremental.py): when
+the cache generation moves, only events whose ``version`` changed are
+reloaded.
+"""
+
+import bisect
+import heapq
+import unicodedata
+
+from sqlalchemy.orm import load_only
+
+from src.constants import SUGGEST_INDEX_MAX_AGE_SECONDS
+from src.models import PublicEvent
+from src.services.incremental import IncrementalIndex
+
+SUGGEST_KINDS = ("tags", "organizations", "events")
+
+
+def normalize(text: str) -> str:
+    """Lowercase ``text`` without accents and with single spaces."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def _keys(value: str) -> list[str]:
+    """``value`` normalized, from the start of each of its words."""
+    words = normalize(value).split(" ")
+    return list(dict.fromkeys(" ".join(words[i:]) for i in range(len(words))))
+
+
+class SuggestIndex(IncrementalIndex):
+    max_age = SUGGEST_INDEX_MAX_AGE_SECONDS
+
+    def __init__(self):
+        super().__init__()
+        self.terms: dict[int, list[tuple[str, str]]] = {}
+        self.counts: dict[tuple[str, str], int] = {}
+        self.entries: dict[str, list[tuple[str, str]]] = {
+            kind: [] for kind in SUGGEST_KINDS
+        }
+
+    def _add(self, event: PublicEvent) -> None:
+        terms = [("tags", tag) for tag in event.tags]
+        terms += [
+            ("organizations", event.organization_name),
+            ("events", event.event_name),
+        ]
+        terms = list(dict.fromkeys(terms))
+        self.terms[event.id] = terms
+
+        for term in terms:
+            self.counts[term] = self.counts.get(term, 0) + 1
+            if self.counts[term] == 1:
+                kind, value = term
+                for key in _keys(value):
+                    bisect.insort(self.entries[kind], (key, value))
+
+    def _remove(self, event_id: int) -> None:
+        for term in self.terms.pop(event_id, []):
+            self.counts[term] -= 1
+            if self.counts[term]:
+                continue
+            del self.counts[term]
+            kind, value = term
+            entries = self.entries[kind]
+            for key in _keys(value):
+                position = bisect.bisect_left(entries, (key, value))
+                del entries[position]
+
+    def _load(self, event_ids: list[int]):
+        return (
+            super()
+            ._load(event_ids)
+            .options(
+                load_only(
+                    PublicEvent.id,
+                    PublicEvent.version,
+                    PublicEvent.organization_name,
+                    PublicEvent.event_name,
+                    PublicEvent.tags,
+                )
+            )
+        )
+
+    def suggest(self, prefix: str, kinds: tuple[str, ...], limit: int) -> dict:
+        """The ``limit`` values of each kind with a word starting with ``prefix``."""
+        self.refresh_if_stale()
+        prefix = normalize(prefix)
+
+        suggestions = {}
+        with self.lock:
+            for kind in kinds:
+                entries = self.entries[kind]
+                found = set()
+                position = bisect.bisect_left(entries, (prefix,))
+                while position < len(entries) and entries[position][0].startswith(
+                    prefix
+                ):
+                    found.add(entries[position][1])
+                    position += 1
+
+                ranked = heapq.nsmallest(
+                    limit,
+                    found,
+                    key=lambda value: (-self.counts[(kind, value)], normalize(value)),
+                )
+                suggestions[kind] = [
+                    {"value": value, "events": self.counts[(kind, value)]}
+                    for value in ranked
+                ]
+        return suggestions
+
+
+suggest_index = SuggestIndex()
+
+
+def suggest(prefix: str, kind: str | None, limit: int) -> dict:
+    """Suggestions for ``prefix``, of one kind or of every kind."""
+    return suggest_index.suggest(prefix, (kind,) if kind else SUGGEST_KINDS, limit)